@@ -8,28 +8,155 @@ Clean up session resources including:
 - Cloud resources (CVM, MySQL, VPC, etc.)
 """
 
+import os
+import re
 import sys
 import json
 import argparse
-import subprocess
 import shutil
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add gitcloud to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-try:
-    from tencentcloud.common import credential
-    from tencentcloud.common.profile.client_profile import ClientProfile
-    from tencentcloud.common.profile.http_profile import HttpProfile
-    from tencentcloud.cvm.v20170312 import cvm_client, models as cvm_models
-    from tencentcloud.cdb.v20170320 import cdb_client, models as cdb_models
-    from tencentcloud.vpc.v20170312 import vpc_client, models as vpc_models
-except ImportError:
+# Local GitCloud state
+GITCLOUD_DIR = Path.home() / ".gitcloud"
+SESSION_BASE = GITCLOUD_DIR / "session"
+CONFIG_FILE = GITCLOUD_DIR / "config.json"
+
+# Tencent Cloud API endpoints
+CVM_ENDPOINT = "cvm.tencentcloudapi.com"
+CDB_ENDPOINT = "cdb.tencentcloudapi.com"
+VPC_ENDPOINT = "vpc.tencentcloudapi.com"
+
+# Maximum number of concurrent delete requests sent to Tencent Cloud
+MAX_DELETE_WORKERS = 8
+
+# "Key: value" lines of interest in the session info files
+KV_RE = re.compile(r'^(Instance ID|Security Group|VPC ID|Region):[ \t]*(\S*)', re.M)
+VPC_RE = re.compile(r'^VPC ID:[ \t]*(\S+)', re.M)
+SUBNET_RE = re.compile(r'\bsubnet-[0-9a-z]+')
+
+# CVM state in which the instance no longer holds its network attachments.
+# TERMINATING is not enough: the ENI and security group stay attached until
+# the instance is SHUTDOWN or disappears from DescribeInstances.
+CVM_RELEASED_STATES = {"SHUTDOWN"}
+# CDB status code for an isolated MySQL instance
+CDB_STATUS_ISOLATED = 5
+
+
+# Tencent Cloud error codes (before the first ".") worth retrying while polling
+TRANSIENT_ERROR_CODES = {
+    "ClientNetworkError",
+    "ServerNetworkError",
+    "InternalError",
+    "RequestLimitExceeded",
+    "ResourceUnavailable",
+}
+
+
+def _is_transient_error(error):
+    """True for network hiccups and throttling, False for auth, SDK or config errors"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # TencentCloudSDKException carries the API error code
+    get_code = getattr(error, 'get_code', None)
+    if get_code is None:
+        return False
+    code = (get_code() or '').split('.')[0]
+    return code in TRANSIENT_ERROR_CODES
+
+
+class Waiter:
+    """Wait for a cloud resource to reach a target state.
+
+    The Tencent Cloud SDK has no built-in waiters, so this mirrors boto3's
+    waiter interface: call describe_fn every `delay` seconds, up to
+    `max_attempts` times, until success(result) is true.
+    """
+
+    def __init__(self, describe_fn, success, delay=2, max_attempts=150):
+        self.describe_fn = describe_fn
+        self.success = success
+        self.delay = delay
+        self.max_attempts = max_attempts
+
+    def wait(self):
+        """Return True once the target state is reached, False on timeout.
+
+        Transient errors raised by describe_fn are treated as "not ready yet";
+        anything else (bad credentials, invalid IDs, SDK errors) is re-raised
+        immediately instead of being polled until the timeout.
+        """
+        for attempt in range(self.max_attempts):
+            try:
+                if self.success(self.describe_fn()):
+                    return True
+            except Exception as e:
+                if not _is_transient_error(e):
+                    raise
+            if attempt < self.max_attempts - 1:
+                time.sleep(self.delay)
+        return False
+
+
+def _print_sdk_missing():
     print("❌ Error: Tencent Cloud SDK not found.")
     print("Please install it with:")
     print("pip install tencentcloud-sdk-python tencentcloud-sdk-python-cdb")
-    sys.exit(1)
+
+
+def _client_profile(endpoint):
+    """Build a ClientProfile pointing at the given API endpoint"""
+    from tencentcloud.common.profile.client_profile import ClientProfile
+    from tencentcloud.common.profile.http_profile import HttpProfile
+
+    http_profile = HttpProfile()
+    http_profile.endpoint = endpoint
+    client_profile = ClientProfile()
+    client_profile.httpProfile = http_profile
+    return client_profile
+
+
+class CredentialsError(Exception):
+    """Raised when Tencent Cloud credentials cannot be loaded from config.json"""
+
+
+def _load_credentials():
+    """Return (secret_id, secret_key) from config.json, raising CredentialsError if unavailable"""
+    try:
+        config = json.loads(CONFIG_FILE.read_bytes())
+    except FileNotFoundError:
+        raise CredentialsError("Config file not found. Please run main.py first to set up credentials.")
+
+    tencent_creds = config.get('tencent_credentials', {})
+    secret_id = tencent_creds.get('secret_id')
+    secret_key = tencent_creds.get('secret_key')
+
+    if not secret_id or not secret_key:
+        raise CredentialsError("Tencent Cloud credentials not found in config. "
+                               "Please run main.py first to set up credentials.")
+
+    return secret_id, secret_key
+
+
+@functools.lru_cache(maxsize=8)
+def _get_clients(secret_id, secret_key, region):
+    """Return cached (cvm, cdb, vpc) clients sharing a single credential"""
+    from tencentcloud.common import credential
+    from tencentcloud.cvm.v20170312 import cvm_client
+    from tencentcloud.cdb.v20170320 import cdb_client
+    from tencentcloud.vpc.v20170312 import vpc_client
+
+    cred = credential.Credential(secret_id, secret_key)
+
+    cvm_cli = cvm_client.CvmClient(cred, region, _client_profile(CVM_ENDPOINT))
+    cdb_cli = cdb_client.CdbClient(cred, region, _client_profile(CDB_ENDPOINT))
+    vpc_cli = vpc_client.VpcClient(cred, region, _client_profile(VPC_ENDPOINT))
+    return cvm_cli, cdb_cli, vpc_cli
 
 
 def parse_session_files(session_dir):
@@ -42,147 +169,145 @@ def parse_session_files(session_dir):
         'security_group_ids': [],
         'region': 'ap-guangzhou'  # default
     }
+    sg_set = set()
+    subnet_set = set()
 
     # Parse CVM info
     cvm_file = session_dir / "02_cvm_info.txt"
     if cvm_file.exists():
-        with open(cvm_file, 'r') as f:
-            for line in f:
-                if line.startswith('Instance ID:'):
-                    resources['cvm_instance_id'] = line.split(':', 1)[1].strip()
-                elif line.startswith('Security Group:'):
-                    sg_id = line.split(':', 1)[1].strip()
-                    if sg_id:
-                        resources['security_group_ids'].append(sg_id)
+        for m in KV_RE.finditer(cvm_file.read_text()):
+            key, value = m.groups()
+            if key == 'Instance ID':
+                resources['cvm_instance_id'] = value
+            elif key == 'Security Group' and value:
+                sg_set.add(value)
 
     # Parse MySQL info
     mysql_file = session_dir / "03_mysql_info.txt"
     if mysql_file.exists():
-        with open(mysql_file, 'r') as f:
-            for line in f:
-                if line.startswith('Instance ID:'):
-                    resources['mysql_instance_id'] = line.split(':', 1)[1].strip()
-                elif line.startswith('Security Group:'):
-                    sg_id = line.split(':', 1)[1].strip()
-                    if sg_id and sg_id not in resources['security_group_ids']:
-                        resources['security_group_ids'].append(sg_id)
+        for m in KV_RE.finditer(mysql_file.read_text()):
+            key, value = m.groups()
+            if key == 'Instance ID':
+                resources['mysql_instance_id'] = value
+            elif key == 'Security Group' and value:
+                sg_set.add(value)
 
     # Parse network info
     network_file = session_dir / "01_network_info.txt"
     if network_file.exists():
-        with open(network_file, 'r') as f:
-            content = f.read()
-            for line in content.split('\n'):
-                if line.startswith('VPC ID:'):
-                    resources['vpc_id'] = line.split(':', 1)[1].strip()
-                elif ':' in line and 'subnet' in line.lower():
-                    # Parse subnet IDs
-                    parts = line.split(':', 1)
-                    if len(parts) == 2:
-                        subnet_id = parts[1].strip()
-                        if subnet_id.startswith('subnet-'):
-                            resources['subnets'].append(subnet_id)
+        content = network_file.read_text()
+        vpc_match = VPC_RE.search(content)
+        if vpc_match:
+            resources['vpc_id'] = vpc_match.group(1)
+        subnet_set.update(SUBNET_RE.findall(content))
 
     # Parse specification for region
     spec_file = session_dir / "00_specification_info.txt"
     if spec_file.exists():
-        with open(spec_file, 'r') as f:
-            for line in f:
-                if line.startswith('Region:'):
-                    resources['region'] = line.split(':', 1)[1].strip()
+        for m in KV_RE.finditer(spec_file.read_text()):
+            key, value = m.groups()
+            if key == 'Region':
+                resources['region'] = value
+
+    resources['security_group_ids'] = sorted(sg_set)
+    resources['subnets'] = sorted(subnet_set)
 
     return resources
 
 
-def cleanup_cloud_resources(resources, region):
-    """Clean up cloud resources"""
+def cleanup_cloud_resources(resources, region, creds):
+    """Clean up cloud resources
+
+    creds is the (secret_id, secret_key) pair returned by _load_credentials().
+    """
     print("\n�� Cleaning up cloud resources...")
 
+    # Imported lazily: the SDK is slow to import and only needed here
     try:
-        # Get credentials from config file
-        config_file = Path.home() / ".gitcloud" / "config.json"
-        if not config_file.exists():
-            print("   ❌ Config file not found. Please run main.py first to set up credentials.")
-            return False
+        from tencentcloud.cvm.v20170312 import models as cvm_models
+        from tencentcloud.cdb.v20170320 import models as cdb_models
+        from tencentcloud.vpc.v20170312 import models as vpc_models
+    except ImportError:
+        _print_sdk_missing()
+        return False
 
-        with open(config_file, 'r') as f:
-            config = json.load(f)
+    try:
+        cvm_cli, cdb_cli, vpc_cli = _get_clients(*creds, region)
 
-        tencent_creds = config.get('tencent_credentials', {})
-        secret_id = tencent_creds.get('secret_id')
-        secret_key = tencent_creds.get('secret_key')
+        def describe_cvm():
+            req = cvm_models.DescribeInstancesRequest()
+            req.InstanceIds = [resources['cvm_instance_id']]
+            return cvm_cli.DescribeInstances(req).InstanceSet
 
-        if not secret_id or not secret_key:
-            print("   ❌ Tencent Cloud credentials not found in config.")
-            print("   Please run main.py first to set up credentials.")
-            return False
+        def cvm_released(instance_set):
+            # An instance that is no longer listed has already been released
+            return not instance_set or instance_set[0].InstanceState in CVM_RELEASED_STATES
+
+        def describe_mysql():
+            req = cdb_models.DescribeDBInstancesRequest()
+            req.InstanceIds = [resources['mysql_instance_id']]
+            return cdb_cli.DescribeDBInstances(req).Items
 
-        cred = credential.Credential(secret_id, secret_key)
-
-        # Initialize clients
-        # CVM client
-        http_profile_cvm = HttpProfile()
-        http_profile_cvm.endpoint = "cvm.tencentcloudapi.com"
-        client_profile_cvm = ClientProfile()
-        client_profile_cvm.httpProfile = http_profile_cvm
-        cvm_cli = cvm_client.CvmClient(cred, region, client_profile_cvm)
-
-        # CDB client
-        http_profile_cdb = HttpProfile()
-        http_profile_cdb.endpoint = "cdb.tencentcloudapi.com"
-        client_profile_cdb = ClientProfile()
-        client_profile_cdb.httpProfile = http_profile_cdb
-        cdb_cli = cdb_client.CdbClient(cred, region, client_profile_cdb)
-
-        # VPC client
-        http_profile_vpc = HttpProfile()
-        http_profile_vpc.endpoint = "vpc.tencentcloudapi.com"
-        client_profile_vpc = ClientProfile()
-        client_profile_vpc.httpProfile = http_profile_vpc
-        vpc_cli = vpc_client.VpcClient(cred, region, client_profile_vpc)
+        def mysql_isolated(items):
+            return not items or items[0].Status == CDB_STATUS_ISOLATED
+
+        def mysql_released(items):
+            # Offlined instances drop out of DescribeDBInstances once their ENI is freed
+            return not items
+
+        cvm_terminated_waiter = Waiter(describe_cvm, cvm_released)
+        mysql_isolated_waiter = Waiter(describe_mysql, mysql_isolated)
+        mysql_released_waiter = Waiter(describe_mysql, mysql_released)
 
         # Terminate CVM instance
-        if resources['cvm_instance_id']:
+        def terminate_cvm():
             try:
                 print(f"   🖥️  Terminating CVM: {resources['cvm_instance_id']}")
                 req = cvm_models.TerminateInstancesRequest()
-                params = {"InstanceIds": [resources['cvm_instance_id']]}
-                req.from_json_string(json.dumps(params))
+                req.InstanceIds = [resources['cvm_instance_id']]
                 cvm_cli.TerminateInstances(req)
                 print(f"   ✅ CVM instance terminated")
+
+                print(f"   ⏳ Waiting for CVM to release its network resources...")
+                if not cvm_terminated_waiter.wait():
+                    print(f"   ⚠️  Timed out waiting for CVM {resources['cvm_instance_id']} to shut down")
+                    return False
+                return True
             except Exception as e:
-                print(f"   ⚠️  Failed to terminate CVM: {e}")
+                print(f"   ⚠️  Failed to terminate CVM or confirm its shutdown: {e}")
+                return False
 
         # Isolate and offline MySQL instance
-        if resources['mysql_instance_id']:
+        def release_mysql():
             try:
                 print(f"   🗄️  Isolating MySQL: {resources['mysql_instance_id']}")
                 req = cdb_models.IsolateDBInstanceRequest()
-                params = {"InstanceId": resources['mysql_instance_id']}
-                req.from_json_string(json.dumps(params))
+                req.InstanceId = resources['mysql_instance_id']
                 cdb_cli.IsolateDBInstance(req)
                 print(f"   ✅ MySQL instance isolated")
 
                 # Wait for isolation to complete
-                import time
-                print(f"   ⏳ Waiting for isolation to complete (10 seconds)...")
-                time.sleep(10)
+                print(f"   ⏳ Waiting for isolation to complete...")
+                if not mysql_isolated_waiter.wait():
+                    print(f"   ⚠️  Timed out waiting for MySQL {resources['mysql_instance_id']} to be isolated")
+                    return False
 
                 # Offline the isolated instance
                 print(f"   🗄️  Offlining MySQL: {resources['mysql_instance_id']}")
                 req = cdb_models.OfflineIsolatedInstancesRequest()
-                params = {"InstanceIds": [resources['mysql_instance_id']]}
-                req.from_json_string(json.dumps(params))
+                req.InstanceIds = [resources['mysql_instance_id']]
                 cdb_cli.OfflineIsolatedInstances(req)
                 print(f"   ✅ MySQL instance offlined")
+
+                # The instance keeps its network interface until it is released
+                print(f"   ⏳ Waiting for MySQL to release its network resources...")
+                if not mysql_released_waiter.wait():
+                    print(f"   ⚠️  Timed out waiting for MySQL {resources['mysql_instance_id']} to be released")
+                    return False
+                return True
             except Exception as e:
                 print(f"   ⚠️  Failed to isolate/offline MySQL: {e}")
-
-        # Wait a bit for resources to detach
-        import time
-        if resources['cvm_instance_id'] or resources['mysql_instance_id']:
-            print("   ⏳ Waiting for resources to detach (30 seconds)...")
-            time.sleep(30)
+                return False
 
         # Helper function for retry logic
         def retry_delete(operation_name, delete_func, max_retries=3, delay=10):
@@ -193,56 +318,71 @@ def cleanup_cloud_resources(resources, region):
                     return True
                 except Exception as e:
                     if attempt < max_retries - 1:
-                        print(f"   ⚠️  Attempt {attempt + 1} failed: {str(e)[:80]}")
+                        print(f"   ⚠️  {operation_name}: attempt {attempt + 1} failed: {str(e)[:80]}")
                         print(f"   ⏳ Waiting {delay} seconds before retry...")
                         time.sleep(delay)
                     else:
-                        print(f"   ❌ Failed after {max_retries} attempts: {str(e)[:100]}")
+                        print(f"   ❌ {operation_name}: failed after {max_retries} attempts: {str(e)[:100]}")
                         return False
             return False
 
-        # Delete subnets FIRST (before security groups)
-        print("\n   🌐 Deleting subnets...")
-        for subnet_id in resources['subnets']:
-            print(f"   🌐 Deleting subnet: {subnet_id}")
-
-            def delete_subnet():
-                req = vpc_models.DeleteSubnetRequest()
-                params = {"SubnetId": subnet_id}
-                req.from_json_string(json.dumps(params))
-                vpc_cli.DeleteSubnet(req)
-                print(f"   ✅ Subnet {subnet_id} deleted")
-
-            retry_delete(f"subnet {subnet_id}", delete_subnet)
-            time.sleep(10)  # Wait between deletions
-
-        # Delete security groups SECOND (after subnets)
-        print("\n   🛡️  Deleting security groups...")
-        for sg_id in resources['security_group_ids']:
-            print(f"   🛡️  Deleting security group: {sg_id}")
-
-            def delete_sg():
-                req = vpc_models.DeleteSecurityGroupRequest()
-                params = {"SecurityGroupId": sg_id}
-                req.from_json_string(json.dumps(params))
-                vpc_cli.DeleteSecurityGroup(req)
-                print(f"   ✅ Security group {sg_id} deleted")
-
-            retry_delete(f"security group {sg_id}", delete_sg)
-            time.sleep(10)  # Wait between deletions
+        def delete_subnet(subnet_id):
+            req = vpc_models.DeleteSubnetRequest()
+            req.SubnetId = subnet_id
+            vpc_cli.DeleteSubnet(req)
+            print(f"   ✅ Subnet {subnet_id} deleted")
+
+        def delete_sg(sg_id):
+            req = vpc_models.DeleteSecurityGroupRequest()
+            req.SecurityGroupId = sg_id
+            vpc_cli.DeleteSecurityGroup(req)
+            print(f"   ✅ Security group {sg_id} deleted")
+
+        def delete_vpc():
+            req = vpc_models.DeleteVpcRequest()
+            req.VpcId = resources['vpc_id']
+            vpc_cli.DeleteVpc(req)
+            print(f"   ✅ VPC {resources['vpc_id']} deleted")
+
+        # Every step reports success, so the caller knows whether the session
+        # files can be removed
+        all_deleted = True
+
+        with ThreadPoolExecutor(max_workers=MAX_DELETE_WORKERS) as executor:
+            # CVM and MySQL are independent of each other, release them together
+            instance_futures = []
+            if resources['cvm_instance_id']:
+                instance_futures.append(executor.submit(terminate_cvm))
+            if resources['mysql_instance_id']:
+                instance_futures.append(executor.submit(release_mysql))
+            for future in as_completed(instance_futures):
+                all_deleted = future.result() and all_deleted
+
+            # Subnets and security groups only depend on the instances being gone,
+            # so they can all be deleted concurrently. The VPC API has no
+            # multi-ID DeleteSubnets/DeleteSecurityGroups, so each ID is its own
+            # request and the batching happens through the executor instead.
+            print("\n   🌐 Deleting subnets and security groups...")
+            network_futures = []
+            for subnet_id in resources['subnets']:
+                print(f"   🌐 Deleting subnet: {subnet_id}")
+                network_futures.append(executor.submit(
+                    retry_delete, f"subnet {subnet_id}", lambda s=subnet_id: delete_subnet(s)))
+            for sg_id in resources['security_group_ids']:
+                print(f"   🛡️  Deleting security group: {sg_id}")
+                network_futures.append(executor.submit(
+                    retry_delete, f"security group {sg_id}", lambda g=sg_id: delete_sg(g)))
+            for future in as_completed(network_futures):
+                all_deleted = future.result() and all_deleted
 
         # Delete VPC LAST (after everything else)
         if resources['vpc_id']:
             print(f"\n   🌐 Deleting VPC: {resources['vpc_id']}")
+            all_deleted = retry_delete(f"VPC {resources['vpc_id']}", delete_vpc) and all_deleted
 
-            def delete_vpc():
-                req = vpc_models.DeleteVpcRequest()
-                params = {"VpcId": resources['vpc_id']}
-                req.from_json_string(json.dumps(params))
-                vpc_cli.DeleteVpc(req)
-                print(f"   ✅ VPC {resources['vpc_id']} deleted")
-
-            retry_delete(f"VPC {resources['vpc_id']}", delete_vpc)
+        if not all_deleted:
+            print("\n⚠️  Some cloud resources could not be deleted")
+            return False
 
         print("\n✅ Cloud resources cleanup completed")
         return True
@@ -259,14 +399,12 @@ def cleanup_local_files(session_dir, keep_logs=False):
     try:
         if keep_logs:
             # Only delete sensitive files (SSH keys)
-            ssh_key = session_dir / "ssh_key"
-            ssh_pub = session_dir / "ssh_key.pub"
-            if ssh_key.exists():
-                ssh_key.unlink()
-                print(f"   🔑 Deleted SSH private key")
-            if ssh_pub.exists():
-                ssh_pub.unlink()
-                print(f"   🔑 Deleted SSH public key")
+            for name, label in (("ssh_key", "private"), ("ssh_key.pub", "public")):
+                try:
+                    os.unlink(session_dir / name)
+                    print(f"   🔑 Deleted SSH {label} key")
+                except FileNotFoundError:
+                    pass
             print(f"   📄 Session logs kept in: {session_dir}")
         else:
             # Delete entire session directory
@@ -282,13 +420,12 @@ def cleanup_local_files(session_dir, keep_logs=False):
 
 def list_sessions():
     """List all available sessions"""
-    session_base = Path.home() / ".gitcloud" / "session"
-
-    if not session_base.exists():
+    if not SESSION_BASE.exists():
         print("No sessions found.")
         return 0
 
-    sessions = [d for d in session_base.iterdir() if d.is_dir() and d.name.startswith('session_')]
+    with os.scandir(SESSION_BASE) as it:
+        sessions = [Path(e.path) for e in it if e.is_dir() and e.name.startswith('session_')]
     if not sessions:
         print("No sessions found.")
         return 0
@@ -298,8 +435,10 @@ def list_sessions():
     for session in sorted(sessions):
         session_name = session.name
         # Check what resources exist
-        has_cvm = (session / "02_cvm_info.txt").exists()
-        has_mysql = (session / "03_mysql_info.txt").exists()
+        with os.scandir(session) as it:
+            files = {e.name for e in it}
+        has_cvm = "02_cvm_info.txt" in files
+        has_mysql = "03_mysql_info.txt" in files
         resources = []
         if has_cvm:
             resources.append("CVM")
@@ -314,51 +453,8 @@ def list_sessions():
     return 0
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='GitCloud Session Cleanup',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Clean up a specific session (removes cloud resources and local files)
-  python cleanup.py session_20250113_143022
-
-  # Keep session logs locally (only delete SSH keys and cloud resources)
-  python cleanup.py session_20250113_143022 --keep-logs
-
-  # Only clean up local files (don't touch cloud resources)
-  python cleanup.py session_20250113_143022 --local-only
-
-  # List all sessions
-  python cleanup.py --list
-        """
-    )
-
-    parser.add_argument('session_id', nargs='?', help='Session ID to clean up (e.g., session_20250113_143022)')
-    parser.add_argument('--keep-logs', action='store_true',
-                       help='Keep session logs, only delete SSH keys and cloud resources')
-    parser.add_argument('--local-only', action='store_true',
-                       help='Only clean up local files, do not touch cloud resources')
-    parser.add_argument('--list', action='store_true',
-                       help='List all available sessions')
-
-    args = parser.parse_args()
-
-    gitcloud_dir = Path.home() / ".gitcloud"
-    session_base = gitcloud_dir / "session"
-
-    # List sessions
-    if args.list:
-        return list_sessions()
-
-    # Validate session ID
-    if not args.session_id:
-        print("❌ Error: Session ID is required")
-        print("Usage: python cleanup.py <session_id>")
-        print("       python cleanup.py --list  (to list all sessions)")
-        return 1
-
-    session_id = args.session_id
+def _run_cleanup(session_id, keep_logs, local_only, session_base):
+    """Clean up a single session; shared by main() and main_with_args()"""
     if not session_id.startswith('session_'):
         session_id = f'session_{session_id}'
 
@@ -367,9 +463,24 @@ Examples:
     if not session_dir.exists():
         print(f"❌ Error: Session not found: {session_dir}")
         print("\nAvailable sessions:")
-        subprocess.run([sys.executable, __file__, '--list'])
+        list_sessions()
         return 1
 
+    # Load credentials once up front
+    creds = None
+    if not local_only:
+        # Check the SDK is installed before asking for confirmation
+        try:
+            import tencentcloud.common
+        except ImportError:
+            _print_sdk_missing()
+            return 1
+        try:
+            creds = _load_credentials()
+        except CredentialsError as e:
+            print(f"❌ {e}")
+            return 1
+
     print("="*70)
     print(f"🧹 GitCloud Session Cleanup")
     print("="*70)
@@ -395,7 +506,7 @@ Examples:
     print(f"  📁 Local files: {session_dir}")
 
     # Confirm
-    if not args.local_only:
+    if not local_only:
         print("\n⚠️  WARNING: This will delete cloud resources and may be irreversible!")
     print("Type 'yes' to confirm cleanup:")
     confirmation = input("> ").strip().lower()
@@ -407,14 +518,15 @@ Examples:
     # Perform cleanup
     success = True
 
-    # Clean up cloud resources
-    if not args.local_only:
-        cloud_success = cleanup_cloud_resources(resources, resources['region'])
-        success = success and cloud_success
+    # Cloud resources first: the session files are the only record of the
+    # resource IDs, so they are kept until the cloud deletes have succeeded
+    if not local_only:
+        success = cleanup_cloud_resources(resources, resources['region'], creds)
 
-    # Clean up local files
-    local_success = cleanup_local_files(session_dir, args.keep_logs)
-    success = success and local_success
+    if success:
+        success = cleanup_local_files(session_dir, keep_logs)
+    else:
+        print(f"\n   📄 Session files kept in {session_dir} so the cleanup can be retried")
 
     if success:
         print("\n" + "="*70)
@@ -428,6 +540,50 @@ Examples:
         return 1
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        description='GitCloud Session Cleanup',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Clean up a specific session (removes cloud resources and local files)
+  python cleanup.py session_20250113_143022
+
+  # Keep session logs locally (only delete SSH keys and cloud resources)
+  python cleanup.py session_20250113_143022 --keep-logs
+
+  # Only clean up local files (don't touch cloud resources)
+  python cleanup.py session_20250113_143022 --local-only
+
+  # List all sessions
+  python cleanup.py --list
+        """
+    )
+
+    parser.add_argument('session_id', nargs='?', help='Session ID to clean up (e.g., session_20250113_143022)')
+    parser.add_argument('--keep-logs', action='store_true',
+                       help='Keep session logs, only delete SSH keys and cloud resources')
+    parser.add_argument('--local-only', action='store_true',
+                       help='Only clean up local files, do not touch cloud resources')
+    parser.add_argument('--list', action='store_true',
+                       help='List all available sessions')
+
+    args = parser.parse_args()
+
+    # List sessions
+    if args.list:
+        return list_sessions()
+
+    # Validate session ID
+    if not args.session_id:
+        print("❌ Error: Session ID is required")
+        print("Usage: python cleanup.py <session_id>")
+        print("       python cleanup.py --list  (to list all sessions)")
+        return 1
+
+    return _run_cleanup(args.session_id, args.keep_logs, args.local_only, SESSION_BASE)
+
+
 def main_with_args(args):
     """Main function that accepts parsed arguments"""
     # Handle --list
@@ -442,87 +598,7 @@ def main_with_args(args):
         print("  gitcloud clean --list")
         return 1
 
-    # Perform cleanup
-    session_base = Path.home() / ".gitcloud" / "session"
-    session_dir = session_base / args.session_id
-
-    if not session_dir.exists():
-        print(f"❌ Session directory not found: {session_dir}")
-        return 1
-
-    # Load config for credentials
-    config_file = Path.home() / ".gitcloud" / "config.json"
-    if not config_file.exists():
-        print("❌ Config file not found. Cannot access cloud credentials.")
-        return 1
-
-    with open(config_file, 'r') as f:
-        config = json.load(f)
-
-    # Get credentials
-    credentials = config.get('tencent_credentials', {})
-    secret_id = credentials.get('secret_id')
-    secret_key = credentials.get('secret_key')
-
-    if not secret_id or not secret_key:
-        print("❌ Tencent Cloud credentials not found in config")
-        return 1
-
-    # Parse session files
-    resources = parse_session_files(session_dir)
-
-    # Display cleanup info
-    print("\n" + "="*70)
-    print("🧹 GitCloud Session Cleanup")
-    print("="*70)
-    print(f"\nSession: {args.session_id}")
-    print(f"Path: {session_dir}\n")
-
-    print("Resources to clean up:")
-    if resources['cvm_instance_id']:
-        print(f"  🖥️  CVM Instance: {resources['cvm_instance_id']}")
-    if resources['mysql_instance_id']:
-        print(f"  🗄️  MySQL Instance: {resources['mysql_instance_id']}")
-    if resources['vpc_id']:
-        print(f"  🌐 VPC: {resources['vpc_id']}")
-    if resources['subnets']:
-        print(f"  🌐 Subnets: {len(resources['subnets'])} subnet(s)")
-    if resources['security_group_ids']:
-        print(f"  🛡️  Security Groups: {len(resources['security_group_ids'])} group(s)")
-    print(f"  📁 Local files: {session_dir}")
-
-    # Confirm
-    if not args.local_only:
-        print("\n⚠️  WARNING: This will delete cloud resources and may be irreversible!")
-    print("Type 'yes' to confirm cleanup:")
-    confirmation = input("> ").strip().lower()
-
-    if confirmation != 'yes':
-        print("❌ Cleanup cancelled")
-        return 0
-
-    # Perform cleanup
-    success = True
-
-    # Clean up cloud resources
-    if not args.local_only:
-        cloud_success = cleanup_cloud_resources(resources, resources['region'])
-        success = success and cloud_success
-
-    # Clean up local files
-    local_success = cleanup_local_files(session_dir, args.keep_logs)
-    success = success and local_success
-
-    if success:
-        print("\n" + "="*70)
-        print("✅ Session cleanup completed successfully!")
-        print("="*70)
-        return 0
-    else:
-        print("\n" + "="*70)
-        print("⚠️  Session cleanup completed with errors")
-        print("="*70)
-        return 1
+    return _run_cleanup(args.session_id, args.keep_logs, args.local_only, SESSION_BASE)
 
 
 if __name__ == '__main__':
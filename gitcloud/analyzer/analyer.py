@@ -8,21 +8,37 @@ Intelligently analyzes GitHub repositories to determine:
 3. Resource specifications for each service
 """
 
+import bisect
+import io
 import os
 import re
 import json
+import shutil
 import subprocess
 import tempfile
 import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from types import MappingProxyType
+from typing import AbstractSet, Optional, Dict, Any, List, Sequence, Tuple
 from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 from .cloud_service_spec import (
     CloudServiceRequirement,
     ServiceRequirement,
     ProjectType,
+    PROJECT_TYPE_BY_VALUE,
     CloudServiceType,
     get_default_services_for_project
 )
@@ -42,10 +58,403 @@ class LogColors:
 # Supported languages for alpha version
 SUPPORTED_LANGUAGES = ['golang', 'nodejs', 'javascript', 'typescript']
 MAX_REPO_SIZE_MB = 200
+MAX_FETCH_WORKERS = 8
+CLONE_TIMEOUT_SECONDS = 60
+KEY_FILE_MAX_CHARS = 3000
 
 # Supported cloud services for alpha version
 SUPPORTED_SERVICES = ['CVM', 'MYSQL']
 
+# 扩展的文件模式检测
+FILE_PATTERNS = {
+    # Python
+    'requirements.txt': 'python_deps',
+    'setup.py': 'python_setup',
+    'pyproject.toml': 'python_modern',
+    'Pipfile': 'python_pipenv',
+    'conda.yml': 'python_conda',
+    'environment.yml': 'python_conda',
+
+    # Node.js
+    'package.json': 'nodejs',
+    'yarn.lock': 'nodejs_yarn',
+    'pnpm-lock.yaml': 'nodejs_pnpm',
+
+    # Java
+    'pom.xml': 'java_maven',
+    'build.gradle': 'java_gradle',
+    'build.gradle.kts': 'java_gradle_kotlin',
+
+    # Go
+    'go.mod': 'golang',
+    'go.sum': 'golang',
+
+    # Rust
+    'Cargo.toml': 'rust',
+
+    # PHP
+    'composer.json': 'php',
+
+    # Ruby
+    'Gemfile': 'ruby',
+
+    # .NET
+    '*.csproj': 'dotnet',
+    '*.sln': 'dotnet_solution',
+
+    # 容器化
+    'Dockerfile': 'docker',
+    'docker-compose.yml': 'docker_compose',
+    'docker-compose.yaml': 'docker_compose',
+
+    # Kubernetes
+    '*.yaml': 'k8s_config',
+    'helm': 'helm',
+
+    # 数据库
+    '*.sql': 'sql_files',
+    'migrations': 'db_migrations',
+
+    # ML/AI
+    '*.ipynb': 'jupyter',
+    'train.py': 'ml_training',
+    'model.py': 'ml_model',
+    'inference.py': 'ml_inference',
+    'requirements-ml.txt': 'ml_requirements',
+
+    # 前端框架
+    'angular.json': 'angular',
+    'vue.config.js': 'vue',
+    'next.config.js': 'nextjs',
+    'nuxt.config.js': 'nuxtjs',
+    'gatsby-config.js': 'gatsby',
+    'svelte.config.js': 'svelte',
+
+    # 移动端
+    'android': 'android',
+    'ios': 'ios',
+    'pubspec.yaml': 'flutter',
+    'capacitor.config.json': 'capacitor',
+
+    # CI/CD
+    '.github/workflows': 'github_actions',
+    '.gitlab-ci.yml': 'gitlab_ci',
+    'Jenkinsfile': 'jenkins',
+
+    # 配置
+    'terraform': 'terraform',
+    'ansible': 'ansible',
+}
+
+# FILE_PATTERNS split into lookup tables so the tree is walked only once
+DIR_SENTINELS = {
+    pattern: file_type for pattern, file_type in FILE_PATTERNS.items()
+    if pattern in ('migrations', 'android', 'ios', 'helm', 'terraform', 'ansible', '.github/workflows')
+}
+EXT_MAP = {
+    pattern[1:]: file_type for pattern, file_type in FILE_PATTERNS.items()
+    if pattern.startswith('*')
+}
+EXACT_NAMES = {
+    pattern: file_type for pattern, file_type in FILE_PATTERNS.items()
+    if pattern not in DIR_SENTINELS and not pattern.startswith('*')
+}
+# Pattern table order, deduplicated, so the AI prompt stays deterministic
+FILE_TYPE_ORDER = tuple(dict.fromkeys(FILE_PATTERNS.values()))
+
+# README candidates, in lookup order
+README_NAMES = ('README.md', 'README.rst', 'README.txt', 'README', 'readme.md')
+
+# Key files read for AI analysis -> analysis_data key
+KEY_FILES = {
+    'requirements.txt': 'python_deps',
+    'package.json': 'node_deps',
+    'go.mod': 'go_deps',
+    'pom.xml': 'java_deps',
+    'Cargo.toml': 'rust_deps',
+    'Dockerfile': 'docker',
+    'docker-compose.yml': 'docker_compose',
+    '.env.example': 'env_example',
+    'requirements-dev.txt': 'dev_deps'
+}
+
+# Directories that never contain project configuration worth scanning
+SKIP_DIRS = frozenset(['.git', 'node_modules', 'venv'])
+
+# README keyword groups used by the rule-based project type detection
+LLM_KEYWORDS = frozenset(['llm', 'gpt', 'bert', 'transformer', 'huggingface', 'openai', 'chatgpt'])
+DATA_KEYWORDS = frozenset(['spark', 'hadoop', 'airflow', 'luigi', 'dask', 'flink', 'kafka'])
+MICROSERVICE_KEYWORDS = frozenset(['microservice', 'grpc', 'service mesh', 'istio'])
+MOBILE_KEYWORDS = frozenset(['mobile', 'ios', 'android', 'flutter', 'react native'])
+ECOMMERCE_KEYWORDS = frozenset(['ecommerce', 'e-commerce', 'shopping', 'cart', 'payment', 'order'])
+GAME_KEYWORDS = frozenset(['game', 'unity', 'unreal', 'multiplayer', 'mmo'])
+CMS_KEYWORDS = frozenset(['cms', 'content management', 'wordpress', 'strapi', 'ghost'])
+
+# API frameworks in detection priority order
+API_INDICATORS = {
+    'flask': 'Flask API',
+    'fastapi': 'FastAPI',
+    'django': 'Django',
+    'express': 'Express.js',
+    'koa': 'Koa.js',
+    'spring': 'Spring Boot',
+    'gin': 'Gin (Go)',
+    'echo': 'Echo (Go)',
+    'actix': 'Actix (Rust)',
+}
+
+# README-only rules checked in order once the file-based checks found nothing:
+# (keyword group, project type, subtype, feature)
+README_TYPE_RULES = (
+    (MOBILE_KEYWORDS, ProjectType.MOBILE_BACKEND, '移动应用后端', 'mobile_backend'),
+    (ECOMMERCE_KEYWORDS, ProjectType.ECOMMERCE, '电商平台', 'ecommerce'),
+    (GAME_KEYWORDS, ProjectType.GAME_SERVER, '游戏服务器', 'game_server'),
+    (CMS_KEYWORDS, ProjectType.CONTENT_MANAGEMENT, 'CMS系统', 'cms'),
+)
+
+# Project types that call for each cloud service
+MYSQL_PROJECT_TYPES = frozenset([
+    ProjectType.WEB_BACKEND,
+    ProjectType.WEB_FULLSTACK,
+    ProjectType.DATABASE_APP,
+    ProjectType.MICROSERVICES,
+    ProjectType.MOBILE_BACKEND,
+    ProjectType.ECOMMERCE,
+    ProjectType.CRM_ERP,
+    ProjectType.CONTENT_MANAGEMENT,
+])
+REDIS_PROJECT_TYPES = frozenset([
+    ProjectType.WEB_BACKEND,
+    ProjectType.WEB_FULLSTACK,
+    ProjectType.MICROSERVICES,
+    ProjectType.MOBILE_BACKEND,
+    ProjectType.ECOMMERCE,
+    ProjectType.LLM_SERVICE,
+])
+OBJECT_STORAGE_PROJECT_TYPES = frozenset([
+    ProjectType.WEB_FULLSTACK,
+    ProjectType.MOBILE_BACKEND,
+    ProjectType.ECOMMERCE,
+    ProjectType.CONTENT_MANAGEMENT,
+    ProjectType.ML_TRAINING,
+    ProjectType.DATA_ETL,
+    ProjectType.BIG_DATA,
+])
+CDN_PROJECT_TYPES = frozenset([
+    ProjectType.WEB_FRONTEND,
+    ProjectType.WEB_STATIC,
+    ProjectType.WEB_FULLSTACK,
+    ProjectType.ECOMMERCE,
+    ProjectType.CONTENT_MANAGEMENT,
+])
+LOAD_BALANCER_PROJECT_TYPES = frozenset([
+    ProjectType.MICROSERVICES,
+    ProjectType.ECOMMERCE,
+    ProjectType.LLM_SERVICE,
+])
+GPU_PROJECT_TYPES = frozenset([ProjectType.ML_TRAINING, ProjectType.ML_INFERENCE, ProjectType.LLM_SERVICE])
+MESSAGE_QUEUE_PROJECT_TYPES = frozenset([ProjectType.MICROSERVICES, ProjectType.BIG_DATA, ProjectType.STREAM_PROCESSING])
+
+# CVM 配置（按项目类型），未列出的类型使用默认配置
+_ML_TRAINING_CVM = MappingProxyType({'cpu_cores': 16, 'memory_gb': 64, 'disk_gb': 500, 'gpu_type': 'V100'})
+_DATA_CVM = MappingProxyType({'cpu_cores': 16, 'memory_gb': 64, 'disk_gb': 500})
+_HIGH_TRAFFIC_CVM = MappingProxyType({'cpu_cores': 8, 'memory_gb': 16, 'disk_gb': 200})
+CVM_CONFIGS = {
+    # ML/AI 项目需要 GPU
+    ProjectType.ML_TRAINING: _ML_TRAINING_CVM,
+    ProjectType.LLM_SERVICE: _ML_TRAINING_CVM,
+    ProjectType.ML_INFERENCE: MappingProxyType({'cpu_cores': 8, 'memory_gb': 32, 'disk_gb': 200, 'gpu_type': 'T4'}),
+    # 数据处理项目
+    ProjectType.BIG_DATA: _DATA_CVM,
+    ProjectType.DATA_ETL: _DATA_CVM,
+    # 高流量项目
+    ProjectType.ECOMMERCE: _HIGH_TRAFFIC_CVM,
+    ProjectType.MICROSERVICES: _HIGH_TRAFFIC_CVM,
+}
+DEFAULT_CVM_CONFIG = MappingProxyType({'cpu_cores': 2, 'memory_gb': 4, 'disk_gb': 100})
+
+# 数据库配置
+HEAVY_DB_PROJECT_TYPES = frozenset([ProjectType.DATABASE_APP, ProjectType.ECOMMERCE])
+HEAVY_DB_CONFIG = MappingProxyType({'cpu_cores': 4, 'memory_mb': 8000, 'storage_gb': 200, 'version': '8.0'})
+STANDARD_DB_PROJECT_TYPES = frozenset([ProjectType.WEB_BACKEND, ProjectType.WEB_FULLSTACK, ProjectType.MOBILE_BACKEND])
+STANDARD_DB_CONFIG = MappingProxyType({'cpu_cores': 2, 'memory_mb': 4000, 'storage_gb': 100, 'version': '8.0'})
+
+# 语言优先级映射（按特异性排序）
+LANGUAGE_PRIORITY = {
+    'golang': 10,
+    'rust': 9,
+    'java_maven': 8,
+    'java_gradle': 8,
+    'nodejs': 7,
+    'python_modern': 6,
+    'python_setup': 5,
+    'python_deps': 4,
+    'php': 3,
+    'ruby': 2,
+}
+
+# File type -> canonical language name
+LANGUAGE_CANONICAL = {
+    'golang': 'golang',
+    'java_maven': 'java',
+    'java_gradle': 'java',
+    'nodejs': 'nodejs',
+    'python_modern': 'python',
+    'python_setup': 'python',
+    'python_deps': 'python',
+    'rust': 'rust',
+    'php': 'php',
+    'ruby': 'ruby',
+}
+
+# (flag, project types, features that also trigger it) for each optional service
+SERVICE_FLAG_RULES = (
+    ('mysql', MYSQL_PROJECT_TYPES, ()),
+    ('redis', REDIS_PROJECT_TYPES, ()),
+    ('object_storage', OBJECT_STORAGE_PROJECT_TYPES, ()),
+    ('cdn', CDN_PROJECT_TYPES, ()),
+    ('load_balancer', LOAD_BALANCER_PROJECT_TYPES, ('high_traffic',)),
+    ('gpu', GPU_PROJECT_TYPES, ('machine_learning',)),
+    ('message_queue', MESSAGE_QUEUE_PROJECT_TYPES, ()),
+)
+
+# (flag, service type, required, reason) of the service emitted for each flag,
+# in output order. A new ServiceRequirement is built per analysis because the
+# instances are mutable.
+SERVICE_REQUIREMENTS = (
+    ('cvm', CloudServiceType.CVM, True, "运行应用程序主服务"),
+    ('mysql', CloudServiceType.MYSQL, True, "持久化存储业务数据"),
+    ('redis', CloudServiceType.REDIS, False, "缓存热点数据，提升性能"),
+    ('object_storage', CloudServiceType.OBJECT_STORAGE, False, "存储文件、图片、视频等静态资源"),
+    ('cdn', CloudServiceType.CDN, False, "加速静态资源访问"),
+    ('load_balancer', CloudServiceType.LOAD_BALANCER, False, "分发流量，提高可用性"),
+    ('gpu', CloudServiceType.GPU_COMPUTE, True, "GPU加速模型训练/推理"),
+    ('kubernetes', CloudServiceType.KUBERNETES, False, "容器编排和微服务管理"),
+    ('message_queue', CloudServiceType.MESSAGE_QUEUE, False, "异步消息处理"),
+)
+
+# One pass over the README finds every keyword above. The lookahead makes
+# matches at different positions overlap, but only the longest keyword is
+# reported at any one position. This therefore gives the same hits as
+# individual substring tests only while no keyword is a prefix of another,
+# which is checked below.
+_README_KEYWORDS = (LLM_KEYWORDS | DATA_KEYWORDS | MICROSERVICE_KEYWORDS | MOBILE_KEYWORDS |
+                    ECOMMERCE_KEYWORDS | GAME_KEYWORDS | CMS_KEYWORDS |
+                    frozenset(API_INDICATORS) | frozenset(['train']))
+README_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(kw) for kw in sorted(_README_KEYWORDS, key=len, reverse=True)) + '))'
+)
+if any(a != b and b.startswith(a) for a in _README_KEYWORDS for b in _README_KEYWORDS):
+    raise ValueError("README keywords must not be prefixes of each other, or README_KEYWORD_RE will miss hits")
+
+# ProjectType values accepted in AI results (mapped back via PROJECT_TYPE_BY_VALUE)
+PROJECT_TYPE_VALUES = tuple(t.value for t in ProjectType)
+
+# Result format requested from the AI, shared by single and batch prompts
+AI_RESULT_SCHEMA = f"""{{
+  "project_type": "选择一个: {', '.join(PROJECT_TYPE_VALUES)}",
+  "project_subtype": "项目子类型描述（可选）",
+  "primary_language": "主要编程语言（golang/python/nodejs/java/rust等）",
+  "needs_gpu": true/false,
+  "gpu_type": "T4/V100/A10/A100/none",
+  "cpu_cores": 数字,
+  "memory_gb": 数字,
+  "disk_gb": 数字,
+  "needs_mysql": true/false,
+  "needs_redis": true/false,
+  "needs_object_storage": true/false,
+  "needs_cdn": true/false,
+  "reasoning": "分析原因"
+}}"""
+
+AI_RESULT_NOTES = """注意：
+- project_type 必须从上述列表中选择
+- primary_language 要根据检测到的依赖文件和代码判断
+- GPU类型用于机器学习项目：T4(入门)、V100(中端)、A10(高端)、A100(顶级)
+- CPU/内存/磁盘要根据项目规模合理估算
+- 数据库、缓存等根据项目实际需求判断"""
+
+# Single-repository prompt; only the project context goes between these
+AI_PROMPT_HEADER = """你是一个云资源分析专家。请分析以下GitHub项目，判断项目类型和所需云服务资源。
+
+项目信息:
+"""
+AI_PROMPT_FOOTER = f"""
+
+请分析并返回JSON格式结果（仅返回JSON，不要其他文字）:
+{AI_RESULT_SCHEMA}
+
+{AI_RESULT_NOTES}"""
+
+# Markdown code fence wrapped around AI JSON responses
+CODE_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+# AI clients keyed by (model, api_key), reused so repeated analyses share
+# the underlying HTTP connection pool
+_AI_CLIENT_CACHE: Dict[Tuple[str, str], Any] = {}
+
+# package.json dependencies that mark a static site generator, matched
+# against the parsed dependency names
+STATIC_SITE_PACKAGES = frozenset(['gatsby', 'next', 'vite'])
+
+# requirements.txt packages that indicate ML workloads / a database, matched
+# as substrings in a single regex pass
+ML_PACKAGE_RE = re.compile('|'.join(map(re.escape, [
+    'tensorflow', 'torch', 'pytorch', 'keras', 'sklearn',
+    'transformers', 'numpy', 'pandas', 'scipy', 'jax',
+])))
+DB_PACKAGE_RE = re.compile('|'.join(map(re.escape, [
+    'mysql', 'pymysql', 'mysqlclient', 'sqlalchemy', 'django', 'flask-sqlalchemy',
+])))
+
+# Feature-count thresholds and the confidence reached at each of them
+CONFIDENCE_THRESHOLDS = (1, 2, 3, 5)
+CONFIDENCE_VALUES = (0.5, 0.6, 0.7, 0.8, 0.9)
+
+# Repository archives are cached here and revalidated with their ETag.
+# Least recently used archives are evicted once the directory exceeds
+# ARCHIVE_CACHE_MAX_BYTES.
+ARCHIVE_CACHE_DIR = Path.home() / ".gitcloud" / "cache" / "archives"
+ARCHIVE_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# Archives larger than this are spooled to disk while downloading
+ARCHIVE_SPOOL_BYTES = 16 * 1024 * 1024
+
+# Guards the archive cache when analyze_batch downloads in parallel
+_ARCHIVE_CACHE_LOCK = threading.Lock()
+
+# Archive downloads share one session so repeated requests to GitHub reuse
+# pooled keep-alive connections instead of a new TLS handshake each time
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount('https://', HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS))
+
+# Remote HEAD lookups with git ls-remote, keyed by repository URL as
+# (resolved_at, sha, timed_out), so repeated analyses in one process skip the
+# round trip. Failed lookups are remembered too (sha None), so an unreachable
+# remote costs a single timeout rather than one per caller.
+REMOTE_HEAD_TTL_SECONDS = 300
+_REMOTE_HEAD_CACHE: Dict[str, Tuple[float, Optional[str], bool]] = {}
+
+# Analysis results keyed by model, repository URL and HEAD commit
+ANALYSIS_CACHE_FILE = Path.home() / ".gitcloud" / "cache" / "analysis_cache.json"
+
+
+def _walk_file_list(paths: List[str]):
+    """Yield os.walk-style (root, dirs, files) triples for a list of relative file paths"""
+    tree = {}
+    for path in paths:
+        parts = path.split('/')
+        for i, name in enumerate(parts[:-1]):
+            tree.setdefault('/'.join(parts[:i]), (set(), []))[0].add(name)
+            # os.walk callers prune these, so nothing below them is visited
+            if name in SKIP_DIRS:
+                break
+        else:
+            tree.setdefault('/'.join(parts[:-1]), (set(), []))[1].append(parts[-1])
+
+    for root, (dirs, files) in tree.items():
+        yield root, sorted(dirs), files
+
 
 class EnhancedResourceAnalyzer:
     """Enhanced analyzer for project type and cloud service requirements"""
@@ -56,6 +465,12 @@ class EnhancedResourceAnalyzer:
         self.model = model
         self.session_dir = session_dir
         self.analysis_data = {}
+        # Relative paths extracted from a downloaded archive, if one was used
+        self.snapshot_files: Optional[List[str]] = None
+        # Lower-cased requirements.txt, read on first use
+        self._requirements_content: Optional[str] = None
+        # Set when the repository archive exceeds MAX_REPO_SIZE_MB
+        self.too_large = False
 
     def log(self, message: str):
         """Log message if verbose mode is enabled"""
@@ -72,30 +487,24 @@ class EnhancedResourceAnalyzer:
         try:
             print(f"{LogColors.INFO}  📊 Checking repository size...{LogColors.RESET}")
 
-            # Use git ls-remote to count commits without cloning
-            result = subprocess.run(
-                ["git", "ls-remote", "--heads", self.repo_url],
-                capture_output=True,
-                timeout=30,
-                text=True
-            )
-
-            if result.returncode != 0:
-                print(f"{LogColors.WARNING}  ⚠️  Unable to check repository, proceeding anyway{LogColors.RESET}")
-                return True
+            # Check the default branch resolves first (usually already looked up for
+            # the cache key), so an unreachable remote is not queried a second time
+            if self._remote_head_sha():
+                # Use git ls-remote to count commits without cloning
+                result = subprocess.run(
+                    ["git", "ls-remote", "--heads", self.repo_url],
+                    capture_output=True,
+                    timeout=30,
+                    text=True
+                )
 
-            # Count number of branches as a simple heuristic
-            branches = len(result.stdout.strip().split('\n')) if result.stdout.strip() else 0
+                if result.returncode != 0:
+                    print(f"{LogColors.WARNING}  ⚠️  Unable to check repository, proceeding anyway{LogColors.RESET}")
+                    return True
 
-            # Try to get commit count from default branch
-            result = subprocess.run(
-                ["git", "ls-remote", self.repo_url, "HEAD"],
-                capture_output=True,
-                timeout=30,
-                text=True
-            )
+                # Count number of branches as a simple heuristic
+                branches = len(result.stdout.strip().split('\n')) if result.stdout.strip() else 0
 
-            if result.returncode == 0 and result.stdout.strip():
                 # Repository exists and is accessible
                 print(f"{LogColors.DEBUG}     Branches detected: {branches}{LogColors.RESET}")
 
@@ -169,12 +578,12 @@ class EnhancedResourceAnalyzer:
         print(f"{LogColors.SUCCESS}  ✅ Language supported: {primary_language}{LogColors.RESET}")
         return True
 
-    def _validate_cloud_services(self, required_services: List) -> bool:
+    def _validate_cloud_services(self, required_services: Sequence[ServiceRequirement]) -> bool:
         """
         Validate if all required cloud services are supported in alpha version
 
         Args:
-            required_services: List of ServiceRequirement objects
+            required_services: Sequence of ServiceRequirement objects
 
         Returns:
             True if all services are supported, False otherwise
@@ -219,29 +628,28 @@ class EnhancedResourceAnalyzer:
         print(f"{LogColors.INFO}  🔍 Validating and analyzing repository...{LogColors.RESET}")
         print(f"{LogColors.DEBUG}     Repository: {self.repo_url}{LogColors.RESET}")
 
+        # A repository whose HEAD has not moved was already analyzed and validated
+        cache_key = self._analysis_cache_key()
+        cached = self._load_cached_analysis(cache_key)
+        if cached:
+            print(f"{LogColors.SUCCESS}  ✅ Using cached analysis for this commit{LogColors.RESET}")
+            return cached
+
         # Step 0: Check repository size before cloning
         if not self._check_repository_size():
             print(f"{LogColors.ERROR}❌ Repository validation failed. Exiting.{LogColors.RESET}")
             sys.exit(1)
 
-        # Step 1: Clone repository
-        temp_dir = self._clone_repository()
+        # Step 1-4: Clone repository and collect the data for AI analysis
+        temp_dir = self._collect_repository_data()
+        if self.too_large:
+            print(f"{LogColors.ERROR}❌ Repository validation failed. Exiting.{LogColors.RESET}")
+            sys.exit(1)
         if not temp_dir:
             print(f"{LogColors.DEBUG}  ⚠️  Failed to clone repository, using default configuration{LogColors.RESET}")
             return self._create_default_requirement()
 
         try:
-            # Step 2: Analyze repository structure
-            self._analyze_repository_files(temp_dir)
-
-            # Step 3: Read README
-            readme_content = self._read_readme(temp_dir)
-            if readme_content:
-                self.analysis_data['readme'] = readme_content[:5000]
-
-            # Step 4: Read key files for AI analysis
-            self._read_key_files(temp_dir)
-
             # Step 5: Try AI analysis (required, no fallback)
             print(f"{LogColors.INFO}  🤖 Running AI-powered analysis...{LogColors.RESET}")
             ai_requirement = self._ai_analyze_comprehensive(temp_dir)
@@ -272,12 +680,209 @@ class EnhancedResourceAnalyzer:
                 print(f"{LogColors.ERROR}❌ Cloud services validation failed. Exiting.{LogColors.RESET}")
                 sys.exit(1)
 
+            self._store_cached_analysis(cache_key, ai_requirement)
             return ai_requirement
 
         finally:
             # Cleanup
             self.log(f"Keeping temp dir for debugging: {temp_dir}")
 
+    def _collect_repository_data(self) -> Optional[str]:
+        """
+        Clone the repository and gather file types, README and key files
+
+        Returns:
+            Path of the cloned repository, or None if cloning failed
+        """
+        # Step 1: Clone repository
+        temp_dir = self._clone_repository()
+        if not temp_dir:
+            return None
+
+        # Step 2: Analyze repository structure
+        self._analyze_repository_files(temp_dir)
+
+        # Step 3: Read README
+        readme_content = self._read_readme(temp_dir)
+        if readme_content:
+            self.analysis_data['readme'] = readme_content
+            # Lower-cased once here for the keyword-based rules
+            self.analysis_data['readme_lower'] = readme_content.lower()
+
+        # Step 4: Read key files for AI analysis
+        self._read_key_files(temp_dir)
+        return temp_dir
+
+    @classmethod
+    def analyze_batch(cls, repo_urls: List[str], verbose: bool = False, model: str = 'deepseek',
+                      batch_size: int = 5, max_workers: int = MAX_FETCH_WORKERS) -> List[Optional[CloudServiceRequirement]]:
+        """
+        Analyze several repositories, sending up to batch_size of them per AI request
+
+        Repositories are fetched and AI batches are requested on up to
+        max_workers threads, since both steps are dominated by network I/O.
+        Unlike analyze(), a repository that fails validation yields None
+        instead of exiting, so one bad repository does not stop the batch.
+
+        Returns:
+            One CloudServiceRequirement (or None) per URL, in input order
+        """
+        results: List[Optional[CloudServiceRequirement]] = [None] * len(repo_urls)
+
+        def prepare(repo_url: str):
+            analyzer = cls(repo_url, verbose=verbose, model=model)
+            cache_key = analyzer._analysis_cache_key()
+            cached = analyzer._load_cached_analysis(cache_key)
+            if cached:
+                return analyzer, cache_key, cached, None
+            if not analyzer._check_repository_size():
+                return analyzer, cache_key, None, None
+            repo_path = analyzer._collect_repository_data()
+            if analyzer.too_large:
+                return analyzer, cache_key, None, None
+            if not repo_path:
+                return analyzer, cache_key, analyzer._create_default_requirement(), None
+            return analyzer, cache_key, None, repo_path
+
+        pending = []  # (index, analyzer, repo_path, cache_key)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for index, (analyzer, cache_key, result, repo_path) in enumerate(executor.map(prepare, repo_urls)):
+                if repo_path:
+                    pending.append((index, analyzer, repo_path, cache_key))
+                else:
+                    results[index] = result
+
+            batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+            batch_requirements = executor.map(
+                lambda batch: cls._ai_analyze_batch([(analyzer, repo_path) for _, analyzer, repo_path, _ in batch]),
+                batches
+            )
+
+            # Validation and cache writes stay on this thread
+            for batch, requirements in zip(batches, batch_requirements):
+                for (index, analyzer, _, cache_key), requirement in zip(batch, requirements):
+                    if not requirement:
+                        continue
+                    if not analyzer._validate_language_support(requirement.primary_language):
+                        continue
+                    if not analyzer._validate_cloud_services(requirement.required_services):
+                        continue
+                    analyzer._store_cached_analysis(cache_key, requirement)
+                    results[index] = requirement
+
+        return results
+
+    @staticmethod
+    def _ai_analyze_batch(batch: List[Tuple['EnhancedResourceAnalyzer', str]]) -> List[Optional[CloudServiceRequirement]]:
+        """Analyze several prepared (analyzer, repo_path) pairs with a single AI request"""
+        if len(batch) == 1:
+            analyzer, repo_path = batch[0]
+            return [analyzer._ai_analyze_comprehensive(repo_path)]
+
+        analyzers = [analyzer for analyzer, _ in batch]
+        lead = analyzers[0]
+        contexts = "\n\n".join(
+            f"### REPO {i}: {analyzer.repo_url}\n{analyzer._build_ai_context()}"
+            for i, analyzer in enumerate(analyzers, 1)
+        )
+        prompt = f"""你是一个云资源分析专家。请分别分析以下 {len(analyzers)} 个GitHub项目，判断每个项目的类型和所需云服务资源。
+
+{contexts}
+
+请返回JSON数组（仅返回JSON，不要其他文字），按 REPO 顺序每个项目一个对象，每个对象格式如下:
+{AI_RESULT_SCHEMA}
+
+{AI_RESULT_NOTES}"""
+
+        try:
+            results = lead._request_ai(prompt, max_tokens=1000 * len(analyzers))
+            if results is None:
+                return [None] * len(analyzers)
+            if isinstance(results, list) and len(results) == len(analyzers):
+                return [analyzer._build_requirement_from_ai_dict(result)
+                        for analyzer, result in zip(analyzers, results)]
+            lead.log("Batch AI response did not match the repository count, analyzing individually")
+        except Exception as e:
+            lead.log(f"Batch AI analysis failed, analyzing individually: {e}")
+
+        return [analyzer._ai_analyze_comprehensive(repo_path) for analyzer, repo_path in batch]
+
+    def _remote_head_sha(self) -> Optional[str]:
+        """
+        Resolve the remote HEAD commit, reusing a recent lookup
+
+        Returns:
+            The commit SHA, or None if the remote could not be resolved
+
+        Raises:
+            subprocess.TimeoutExpired: If the remote did not answer in time
+        """
+        cached = _REMOTE_HEAD_CACHE.get(self.repo_url)
+        if cached and time.monotonic() - cached[0] < REMOTE_HEAD_TTL_SECONDS:
+            _, sha, timed_out = cached
+            if timed_out:
+                raise subprocess.TimeoutExpired(["git", "ls-remote", self.repo_url, "HEAD"], 30)
+            return sha
+
+        sha = None
+        try:
+            result = subprocess.run(
+                ["git", "ls-remote", self.repo_url, "HEAD"],
+                capture_output=True,
+                timeout=30,
+                text=True,
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                sha = result.stdout.split()[0]
+        except subprocess.TimeoutExpired:
+            _REMOTE_HEAD_CACHE[self.repo_url] = (time.monotonic(), None, True)
+            raise
+        except (subprocess.SubprocessError, OSError) as e:
+            self.log(f"Unable to resolve HEAD commit: {e}")
+
+        _REMOTE_HEAD_CACHE[self.repo_url] = (time.monotonic(), sha, False)
+        return sha
+
+    def _analysis_cache_key(self) -> Optional[str]:
+        """Build the analysis cache key from the remote HEAD commit, None if unavailable"""
+        try:
+            sha = self._remote_head_sha()
+        except subprocess.TimeoutExpired:
+            sha = None
+        if sha is None:
+            self.log("Unable to resolve HEAD commit, analysis cache disabled")
+            return None
+        return f"{self.model}:{self.repo_url}@{sha}"
+
+    def _load_cached_analysis(self, cache_key: Optional[str]) -> Optional[CloudServiceRequirement]:
+        """Return the cached analysis for cache_key, if any"""
+        if not cache_key:
+            return None
+        try:
+            data = json.loads(ANALYSIS_CACHE_FILE.read_text())
+            if cache_key in data:
+                return CloudServiceRequirement.from_dict(data[cache_key])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # Unreadable file, or an entry written by an older format
+            self.log(f"Ignoring analysis cache: {e}")
+        return None
+
+    def _store_cached_analysis(self, cache_key: Optional[str], requirement: CloudServiceRequirement):
+        """Record a validated analysis under cache_key"""
+        if not cache_key:
+            return
+        try:
+            data = json.loads(ANALYSIS_CACHE_FILE.read_text())
+        except (OSError, ValueError):
+            data = {}
+        data[cache_key] = requirement.to_dict()
+        try:
+            ANALYSIS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            ANALYSIS_CACHE_FILE.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+        except OSError as e:
+            self.log(f"Unable to write analysis cache: {e}")
+
     def _clone_repository(self) -> Optional[str]:
         """Clone repository to temporary directory"""
         try:
@@ -287,12 +892,32 @@ class EnhancedResourceAnalyzer:
                 Path(temp_dir).mkdir(parents=True, exist_ok=True)
             else:
                 temp_dir = tempfile.mkdtemp(prefix="gitcloud_analysis_")
+            # GitHub serves a snapshot archive, which is much cheaper than a clone
+            if urlparse(self.repo_url).hostname in ('github.com', 'www.github.com'):
+                fetched = self._fetch_zip(temp_dir)
+                if fetched:
+                    return temp_dir
+                if fetched is None:
+                    # A clone of the same repository would be just as large
+                    self.too_large = True
+                    print(f"{LogColors.ERROR}❌ REPOSITORY TOO LARGE: archive exceeds {MAX_REPO_SIZE_MB}MB{LogColors.RESET}")
+                    return None
+                self.log("Archive download failed, falling back to git clone")
+
             self.log(f"Cloning repository to {temp_dir}")
 
+            cloned = self._clone_in_process(temp_dir)
+            if cloned:
+                self.log("Repository cloned successfully")
+                return temp_dir
+            if cloned is None:
+                # A timed-out clone may still be writing to temp_dir
+                return None
+
             result = subprocess.run(
                 ["git", "clone", "--depth", "1", self.repo_url, temp_dir],
                 capture_output=True,
-                timeout=60,
+                timeout=CLONE_TIMEOUT_SECONDS,
                 text=True
             )
 
@@ -307,156 +932,281 @@ class EnhancedResourceAnalyzer:
             self.log(f"Error cloning repository: {e}")
             return None
 
-    def _analyze_repository_files(self, repo_path: str):
-        """Analyze repository file structure with comprehensive detection"""
-        self.log("Analyzing repository files")
+    def _clone_in_process(self, temp_dir: str) -> Optional[bool]:
+        """
+        Shallow clone with pygit2 or dulwich, avoiding a git subprocess
 
-        # 扩展的文件模式检测
-        file_patterns = {
-            # Python
-            'requirements.txt': 'python_deps',
-            'setup.py': 'python_setup',
-            'pyproject.toml': 'python_modern',
-            'Pipfile': 'python_pipenv',
-            'conda.yml': 'python_conda',
-            'environment.yml': 'python_conda',
-
-            # Node.js
-            'package.json': 'nodejs',
-            'yarn.lock': 'nodejs_yarn',
-            'pnpm-lock.yaml': 'nodejs_pnpm',
-
-            # Java
-            'pom.xml': 'java_maven',
-            'build.gradle': 'java_gradle',
-            'build.gradle.kts': 'java_gradle_kotlin',
-
-            # Go
-            'go.mod': 'golang',
-            'go.sum': 'golang',
-
-            # Rust
-            'Cargo.toml': 'rust',
-
-            # PHP
-            'composer.json': 'php',
-
-            # Ruby
-            'Gemfile': 'ruby',
-
-            # .NET
-            '*.csproj': 'dotnet',
-            '*.sln': 'dotnet_solution',
-
-            # 容器化
-            'Dockerfile': 'docker',
-            'docker-compose.yml': 'docker_compose',
-            'docker-compose.yaml': 'docker_compose',
-
-            # Kubernetes
-            '*.yaml': 'k8s_config',
-            'helm': 'helm',
-
-            # 数据库
-            '*.sql': 'sql_files',
-            'migrations': 'db_migrations',
-
-            # ML/AI
-            '*.ipynb': 'jupyter',
-            'train.py': 'ml_training',
-            'model.py': 'ml_model',
-            'inference.py': 'ml_inference',
-            'requirements-ml.txt': 'ml_requirements',
-
-            # 前端框架
-            'angular.json': 'angular',
-            'vue.config.js': 'vue',
-            'next.config.js': 'nextjs',
-            'nuxt.config.js': 'nuxtjs',
-            'gatsby-config.js': 'gatsby',
-            'svelte.config.js': 'svelte',
-
-            # 移动端
-            'android': 'android',
-            'ios': 'ios',
-            'pubspec.yaml': 'flutter',
-            'capacitor.config.json': 'capacitor',
-
-            # CI/CD
-            '.github/workflows': 'github_actions',
-            '.gitlab-ci.yml': 'gitlab_ci',
-            'Jenkinsfile': 'jenkins',
-
-            # 配置
-            'terraform': 'terraform',
-            'ansible': 'ansible',
-        }
+        Neither library takes a timeout, so the clone runs on a daemon thread
+        that is abandoned after CLONE_TIMEOUT_SECONDS, the same bound as the
+        git subprocess.
 
-        found_files = []
-        repo_path_obj = Path(repo_path)
+        Returns:
+            True if cloned, False if neither library is available or both failed,
+            None if the clone timed out
+        """
+        outcome: List[bool] = []
+        worker = threading.Thread(
+            target=lambda: outcome.append(self._clone_with_backends(temp_dir)),
+            daemon=True
+        )
+        worker.start()
+        worker.join(CLONE_TIMEOUT_SECONDS)
+        if worker.is_alive():
+            self.log(f"In-process clone timed out after {CLONE_TIMEOUT_SECONDS}s")
+            return None
+        return bool(outcome and outcome[0])
 
-        for pattern, file_type in file_patterns.items():
-            if '*' in pattern or pattern in ['migrations', 'android', 'ios', 'helm', 'terraform', 'ansible']:
-                # Directory or glob pattern
-                matches = list(repo_path_obj.rglob(pattern))
-            else:
-                # Exact filename
-                matches = list(repo_path_obj.rglob(pattern))
+    def _clone_with_backends(self, temp_dir: str) -> bool:
+        """Try each in-process clone backend in turn"""
+        for name, clone in (('pygit2', self._clone_with_pygit2), ('dulwich', self._clone_with_dulwich)):
+            try:
+                if clone(temp_dir):
+                    return True
+            except Exception as e:
+                self.log(f"{name} clone failed: {e}")
+                # The next backend (or git) needs an empty target directory
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                Path(temp_dir).mkdir(parents=True, exist_ok=True)
+        return False
 
-            if matches:
-                found_files.append(file_type)
-                self.log(f"Found {file_type}: {len(matches)} items")
+    def _clone_with_pygit2(self, temp_dir: str) -> bool:
+        """Shallow clone through libgit2; False if pygit2 is not installed"""
+        try:
+            import pygit2
+        except ImportError:
+            return False
+        pygit2.clone_repository(self.repo_url, temp_dir, depth=1)
+        return True
 
-        self.analysis_data['found_files'] = found_files
+    def _clone_with_dulwich(self, temp_dir: str) -> bool:
+        """Shallow clone with dulwich; False if dulwich is not installed"""
+        try:
+            from dulwich import porcelain
+        except ImportError:
+            return False
+        porcelain.clone(self.repo_url, temp_dir, depth=1, errstream=io.BytesIO())
+        return True
+
+    def _fetch_zip(self, temp_dir: str) -> Optional[bool]:
+        """
+        Download the default branch of a GitHub repository as a ZIP archive
+        and extract it into temp_dir (without the archive's top-level folder)
 
-        # Count files
+        Returns:
+            True if the snapshot was extracted, None if the archive exceeds
+            MAX_REPO_SIZE_MB, False otherwise
+        """
+        parts = urlparse(self.repo_url).path.strip('/').split('/')
+        if len(parts) < 2:
+            return False
+        owner, repo = parts[0], parts[1]
+        if repo.endswith('.git'):
+            repo = repo[:-4]
+
+        url = f"https://codeload.github.com/{owner}/{repo}/zip/HEAD"
+        self.log(f"Downloading repository archive from {url}")
+
+        # A previously downloaded archive is revalidated with If-None-Match,
+        # so an unchanged repository costs a 304 instead of a full download
+        cache_key = f"{owner}_{repo}".lower()
+        cached_zip = ARCHIVE_CACHE_DIR / f"{cache_key}.zip"
+        etag_file = ARCHIVE_CACHE_DIR / "etag_cache.json"
+        etags = {}
         try:
-            file_count = sum(1 for _ in repo_path_obj.rglob('*') if _.is_file())
-            self.analysis_data['file_count'] = file_count
-        except Exception:
+            etags = json.loads(etag_file.read_text())
+        except (OSError, ValueError):
             pass
 
-    def _read_readme(self, repo_path: str) -> Optional[str]:
-        """Read README file"""
-        readme_names = ['README.md', 'README.rst', 'README.txt', 'README', 'readme.md']
+        headers = {}
+        if cache_key in etags and cached_zip.exists():
+            headers['If-None-Match'] = etags[cache_key]
 
-        for readme_name in readme_names:
-            readme_path = Path(repo_path) / readme_name
-            if readme_path.exists():
+        # Small archives stay in memory, larger ones spill to a temporary file
+        buffer = tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_BYTES)
+        try:
+            with _HTTP_SESSION.get(url, headers=headers, stream=True, timeout=60) as response:
+                if response.status_code == 304:
+                    self.log("Repository unchanged, using cached archive")
+                    buffer.close()
+                    buffer = open(cached_zip, 'rb')
+                    # Mark as recently used for eviction
+                    os.utime(cached_zip)
+                elif response.status_code != 200:
+                    self.log(f"Archive download returned HTTP {response.status_code}")
+                    return False
+                else:
+                    max_bytes = MAX_REPO_SIZE_MB * 1024 * 1024
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        buffer.write(chunk)
+                        if buffer.tell() > max_bytes:
+                            self.log(f"Archive exceeds {MAX_REPO_SIZE_MB}MB, aborting download")
+                            return None
+
+                    etag = response.headers.get('ETag')
+                    if etag:
+                        self._cache_archive(cached_zip, etag_file, etags, cache_key, etag, buffer)
+
+            root = os.path.realpath(temp_dir)
+            extracted = []
+            with zipfile.ZipFile(buffer) as archive:
+                for info in archive.infolist():
+                    # Strip the "<repo>-<ref>/" folder GitHub wraps the snapshot in
+                    relative = info.filename.split('/', 1)[1] if '/' in info.filename else ''
+                    if not relative or info.is_dir():
+                        continue
+
+                    # Zip Slip guard: never write outside temp_dir
+                    target = os.path.realpath(os.path.join(root, relative))
+                    if not target.startswith(root + os.sep):
+                        self.log(f"Skipping unsafe archive entry: {info.filename}")
+                        continue
+
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with archive.open(info) as src, open(target, 'wb') as dst:
+                        shutil.copyfileobj(src, dst)
+                    extracted.append(relative)
+
+            # The file list is already known, so the analysis need not walk the tree again
+            self.snapshot_files = extracted
+            self.log("Repository archive extracted successfully")
+            return True
+
+        except Exception as e:
+            self.log(f"Error downloading repository archive: {e}")
+            # Leave an empty directory behind so git clone can still use it
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            Path(temp_dir).mkdir(parents=True, exist_ok=True)
+            return False
+
+        finally:
+            buffer.close()
+
+    def _cache_archive(self, cached_zip: Path, etag_file: Path, etags: Dict[str, str],
+                       cache_key: str, etag: str, buffer):
+        """Store a downloaded archive and its ETag for later conditional requests"""
+        try:
+            with _ARCHIVE_CACHE_LOCK:
+                ARCHIVE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                buffer.seek(0)
+                with open(cached_zip, 'wb') as f:
+                    shutil.copyfileobj(buffer, f)
+                # Pick up entries written by other analyzers since etags was read
                 try:
-                    with open(readme_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        self.log(f"Read README: {len(content)} characters")
-                        return content
-                except Exception as e:
-                    self.log(f"Error reading README: {e}")
+                    etags.update(json.loads(etag_file.read_text()))
+                except (OSError, ValueError):
+                    pass
+                etags[cache_key] = etag
+                self._evict_archives(etags)
+                etag_file.write_text(json.dumps(etags, indent=2))
+        except OSError as e:
+            self.log(f"Unable to cache repository archive: {e}")
+
+    def _evict_archives(self, etags: Dict[str, str]):
+        """Delete least recently used archives until the cache fits ARCHIVE_CACHE_MAX_BYTES"""
+        archives = []
+        for entry in os.scandir(ARCHIVE_CACHE_DIR):
+            if entry.name.endswith('.zip') and entry.is_file():
+                stat = entry.stat()
+                archives.append((stat.st_mtime, stat.st_size, entry.path, entry.name[:-4]))
+
+        total = sum(size for _, size, _, _ in archives)
+        for _, size, path, key in sorted(archives):
+            if total <= ARCHIVE_CACHE_MAX_BYTES:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            etags.pop(key, None)
+            self.log(f"Evicted cached archive {key}")
+
+    def _analyze_repository_files(self, repo_path: str):
+        """Analyze repository file structure with comprehensive detection"""
+        self.log("Analyzing repository files")
+
+        match_counts = {}
+        file_count = 0
+
+        if self.snapshot_files is not None:
+            tree = _walk_file_list(self.snapshot_files)
+        else:
+            tree = os.walk(repo_path)
+
+        for root, dirs, files in tree:
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            file_count += len(files)
+
+            for d in dirs:
+                file_type = DIR_SENTINELS.get(d)
+                if file_type:
+                    match_counts[file_type] = match_counts.get(file_type, 0) + 1
+            if os.path.basename(root) == '.github' and 'workflows' in dirs:
+                file_type = DIR_SENTINELS['.github/workflows']
+                match_counts[file_type] = match_counts.get(file_type, 0) + 1
+
+            for f in files:
+                file_type = EXACT_NAMES.get(f)
+                if file_type:
+                    match_counts[file_type] = match_counts.get(file_type, 0) + 1
+                file_type = EXT_MAP.get(os.path.splitext(f)[1])
+                if file_type:
+                    match_counts[file_type] = match_counts.get(file_type, 0) + 1
+
+        found_files = []
+        for file_type in FILE_TYPE_ORDER:
+            if file_type in match_counts:
+                found_files.append(file_type)
+                self.log(f"Found {file_type}: {match_counts[file_type]} items")
+
+        self.analysis_data['found_files'] = found_files
+        # Set view of found_files for O(1) membership tests in the rule checks
+        self.analysis_data['found_file_set'] = frozenset(found_files)
+        self.analysis_data['file_count'] = file_count
+
+    def _found_file_set(self) -> AbstractSet[str]:
+        """Detected file types as a set"""
+        found_file_set = self.analysis_data.get('found_file_set')
+        if found_file_set is None:
+            found_file_set = frozenset(self.analysis_data.get('found_files', ()))
+        return found_file_set
+
+    def _read_readme(self, repo_path: str, max_chars: int = 5000) -> Optional[str]:
+        """Read README file, keeping at most max_chars characters"""
+        for readme_name in README_NAMES:
+            try:
+                with open(os.path.join(repo_path, readme_name), 'r', encoding='utf-8', errors='ignore') as f:
+                    # 多读一个字符，用于判断是否被截断
+                    content = f.read(max_chars + 1)
+                    truncated = len(content) > max_chars
+                    content = content[:max_chars]
+                    self.log(f"Read README: {len(content)} characters" + (" (truncated)" if truncated else ""))
+                    return content
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                self.log(f"Error reading README: {e}")
 
         return None
 
     def _read_key_files(self, repo_path: str):
         """Read key configuration files for AI analysis"""
-        key_files = {
-            'requirements.txt': 'python_deps',
-            'package.json': 'node_deps',
-            'go.mod': 'go_deps',
-            'pom.xml': 'java_deps',
-            'Cargo.toml': 'rust_deps',
-            'Dockerfile': 'docker',
-            'docker-compose.yml': 'docker_compose',
-            '.env.example': 'env_example',
-            'requirements-dev.txt': 'dev_deps'
-        }
-
-        for filename, key in key_files.items():
-            file_path = Path(repo_path) / filename
-            if file_path.exists():
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        self.analysis_data[key] = content[:3000]  # Limit to 3000 chars
-                        self.log(f"Read {filename}: {len(content)} characters")
-                except Exception as e:
-                    self.log(f"Error reading {filename}: {e}")
+        for filename, key in KEY_FILES.items():
+            content = self._read_key_file(os.path.join(repo_path, filename), KEY_FILE_MAX_CHARS)
+            if content is not None:
+                self.analysis_data[key] = content
+                self.log(f"Read {filename}: {len(content)} characters")
+
+    def _read_key_file(self, file_path: str, max_chars: int) -> Optional[str]:
+        """Read up to max_chars of a key file, returning None if it is missing or unreadable"""
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read(max_chars)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.log(f"Error reading {os.path.basename(file_path)}: {e}")
+            return None
 
     def _ai_analyze_comprehensive(self, repo_path: str) -> Optional[CloudServiceRequirement]:
         """
@@ -466,183 +1216,163 @@ class EnhancedResourceAnalyzer:
             CloudServiceRequirement if AI analysis succeeds, None otherwise
         """
         try:
-            import anthropic
-        except ImportError:
-            self.log("Anthropic package not installed, skipping AI analysis")
-            return None
+            # Construct AI prompt
+            prompt = AI_PROMPT_HEADER + self._build_ai_context() + AI_PROMPT_FOOTER
 
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            self.log("ANTHROPIC_API_KEY not set, skipping AI analysis")
-            return None
+            result = self._request_ai(prompt, max_tokens=1000)
+            if result is None:
+                return None
+            return self._build_requirement_from_ai_dict(result)
 
-        try:
-            # Prepare analysis context
-            context_parts = []
+        except Exception as e:
+            self.log(f"AI analysis failed: {e}")
+            import traceback
+            if self.verbose:
+                traceback.print_exc()
+            return None
 
-            # Add README
-            if 'readme' in self.analysis_data:
-                context_parts.append(f"README内容:\n{self.analysis_data['readme']}")
+    def _build_ai_context(self) -> str:
+        """Assemble the collected repository data into the AI prompt context"""
+        context_parts = []
 
-            # Add dependencies
-            if 'python_deps' in self.analysis_data:
-                context_parts.append(f"\nrequirements.txt:\n{self.analysis_data['python_deps']}")
-            if 'node_deps' in self.analysis_data:
-                context_parts.append(f"\npackage.json:\n{self.analysis_data['node_deps']}")
-            if 'go_deps' in self.analysis_data:
-                context_parts.append(f"\ngo.mod:\n{self.analysis_data['go_deps']}")
+        # Add README
+        if 'readme' in self.analysis_data:
+            context_parts.append(f"README内容:\n{self.analysis_data['readme']}")
 
-            # Add Docker files
-            if 'docker' in self.analysis_data:
-                context_parts.append(f"\nDockerfile:\n{self.analysis_data['docker']}")
-            if 'docker_compose' in self.analysis_data:
-                context_parts.append(f"\ndocker-compose.yml:\n{self.analysis_data['docker_compose']}")
+        # Add dependencies
+        if 'python_deps' in self.analysis_data:
+            context_parts.append(f"\nrequirements.txt:\n{self.analysis_data['python_deps']}")
+        if 'node_deps' in self.analysis_data:
+            context_parts.append(f"\npackage.json:\n{self.analysis_data['node_deps']}")
+        if 'go_deps' in self.analysis_data:
+            context_parts.append(f"\ngo.mod:\n{self.analysis_data['go_deps']}")
 
-            # Add found files summary
-            if 'found_files' in self.analysis_data:
-                context_parts.append(f"\n检测到的文件类型: {', '.join(self.analysis_data['found_files'])}")
+        # Add Docker files
+        if 'docker' in self.analysis_data:
+            context_parts.append(f"\nDockerfile:\n{self.analysis_data['docker']}")
+        if 'docker_compose' in self.analysis_data:
+            context_parts.append(f"\ndocker-compose.yml:\n{self.analysis_data['docker_compose']}")
 
-            context = "\n".join(context_parts)
+        # Add found files summary
+        if 'found_files' in self.analysis_data:
+            context_parts.append(f"\n检测到的文件类型: {', '.join(self.analysis_data['found_files'])}")
 
-            # Project type options
-            project_types = [t.value for t in ProjectType]
+        return "\n".join(context_parts)
 
-            # Construct AI prompt
-            prompt = f"""你是一个云资源分析专家。请分析以下GitHub项目，判断项目类型和所需云服务资源。
+    def _request_ai(self, prompt: str, max_tokens: int) -> Optional[Any]:
+        """
+        Send prompt to the selected model and parse its JSON reply
 
-项目信息:
-{context}
+        Returns:
+            Parsed JSON, or None if the AI backend is not available
+        """
+        try:
+            import anthropic
+        except ImportError:
+            self.log("Anthropic package not installed, skipping AI analysis")
+            return None
 
-请分析并返回JSON格式结果（仅返回JSON，不要其他文字）:
-{{
-  "project_type": "选择一个: {', '.join(project_types)}",
-  "project_subtype": "项目子类型描述（可选）",
-  "primary_language": "主要编程语言（golang/python/nodejs/java/rust等）",
-  "needs_gpu": true/false,
-  "gpu_type": "T4/V100/A10/A100/none",
-  "cpu_cores": 数字,
-  "memory_gb": 数字,
-  "disk_gb": 数字,
-  "needs_mysql": true/false,
-  "needs_redis": true/false,
-  "needs_object_storage": true/false,
-  "needs_cdn": true/false,
-  "reasoning": "分析原因"
-}}
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            self.log("ANTHROPIC_API_KEY not set, skipping AI analysis")
+            return None
 
-注意：
-- project_type 必须从上述列表中选择
-- primary_language 要根据检测到的依赖文件和代码判断
-- GPU类型用于机器学习项目：T4(入门)、V100(中端)、A10(高端)、A100(顶级)
-- CPU/内存/磁盘要根据项目规模合理估算
-- 数据库、缓存等根据项目实际需求判断"""
+        # Call AI API based on selected model
+        client = self._get_ai_client(anthropic, api_key)
+        if self.model == 'deepseek':
+            model_name = "deepseek-chat"
+        else:  # anthropic
+            model_name = "claude-sonnet-4-20250514"
+
+        # Stream the reply so long (batched) generations are read as they arrive
+        # instead of holding one request open until the whole body is ready
+        with client.messages.stream(
+            model=model_name,
+            max_tokens=max_tokens,
+            temperature=0.0,
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            response_text = "".join(stream.text_stream).strip()
+
+        # Remove markdown code blocks if present
+        response_text = CODE_FENCE_RE.sub('', response_text)
+
+        # Parse JSON
+        return _json_loads(response_text)
+
+    def _build_requirement_from_ai_dict(self, result: Dict[str, Any]) -> CloudServiceRequirement:
+        """Validate an AI result object and construct the CloudServiceRequirement"""
+        project_type_str = result.get('project_type', ProjectType.GENERAL.value)
+        project_type = PROJECT_TYPE_BY_VALUE.get(project_type_str, ProjectType.GENERAL)
+
+        # Build required services list
+        required_services = []
 
-            # Call AI API based on selected model
-            if self.model == 'deepseek':
-                client = anthropic.Anthropic(api_key=api_key, base_url="https://api.deepseek.com/anthropic")
-                model_name = "deepseek-chat"
-            else:  # anthropic
-                client = anthropic.Anthropic(api_key=api_key)
-                model_name = "claude-sonnet-4-20250514"
+        # CVM config
+        cvm_config = ServiceRequirement(
+            service_type=CloudServiceType.CVM,
+            cpu_cores=result.get('cpu_cores', 2),
+            memory_gb=result.get('memory_gb', 4),
+            disk_gb=max(result.get('disk_gb', 100), 50),  # Ensure minimum 50GB
+            gpu_required=result.get('needs_gpu', False),
+            gpu_type=result.get('gpu_type') if result.get('needs_gpu') else None
+        )
+        required_services.append(cvm_config)
 
-            message = client.messages.create(
-                model=model_name,
-                max_tokens=1000,
-                temperature=0.0,
-                messages=[{"role": "user", "content": prompt}]
+        # MySQL
+        if result.get('needs_mysql', False):
+            mysql_config = ServiceRequirement(
+                service_type=CloudServiceType.MYSQL,
+                cpu_cores=2,
+                memory_gb=4,
+                disk_gb=100
             )
+            required_services.append(mysql_config)
 
-            response_text = message.content[0].text.strip()
-
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-
-            # Parse JSON
-            result = json.loads(response_text)
-
-            # Validate and construct CloudServiceRequirement
-            project_type_str = result.get('project_type', 'WEB_APPLICATION')
-            try:
-                project_type = ProjectType(project_type_str)
-            except ValueError:
-                # Try to match by value
-                project_type = ProjectType.WEB_APPLICATION
-                for pt in ProjectType:
-                    if pt.value == project_type_str:
-                        project_type = pt
-                        break
-
-            # Build required services list
-            required_services = []
-
-            # CVM config
-            cvm_config = ServiceRequirement(
-                service_type=CloudServiceType.CVM,
-                cpu_cores=result.get('cpu_cores', 2),
-                memory_gb=result.get('memory_gb', 4),
-                disk_gb=max(result.get('disk_gb', 100), 50),  # Ensure minimum 50GB
-                gpu_required=result.get('needs_gpu', False),
-                gpu_type=result.get('gpu_type') if result.get('needs_gpu') else None
+        # Redis
+        if result.get('needs_redis', False):
+            redis_config = ServiceRequirement(
+                service_type=CloudServiceType.REDIS,
+                memory_gb=2
             )
-            required_services.append(cvm_config)
-
-            # MySQL
-            if result.get('needs_mysql', False):
-                mysql_config = ServiceRequirement(
-                    service_type=CloudServiceType.MYSQL,
-                    cpu_cores=2,
-                    memory_gb=4,
-                    disk_gb=100
-                )
-                required_services.append(mysql_config)
+            required_services.append(redis_config)
 
-            # Redis
-            if result.get('needs_redis', False):
-                redis_config = ServiceRequirement(
-                    service_type=CloudServiceType.REDIS,
-                    memory_gb=2
-                )
-                required_services.append(redis_config)
-
-            # Object Storage
-            if result.get('needs_object_storage', False):
-                storage_config = ServiceRequirement(
-                    service_type=CloudServiceType.OBJECT_STORAGE,
-                    disk_gb=500
-                )
-                required_services.append(storage_config)
+        # Object Storage
+        if result.get('needs_object_storage', False):
+            storage_config = ServiceRequirement(
+                service_type=CloudServiceType.OBJECT_STORAGE,
+                disk_gb=500
+            )
+            required_services.append(storage_config)
 
-            # CDN
-            if result.get('needs_cdn', False):
-                cdn_config = ServiceRequirement(
-                    service_type=CloudServiceType.CDN
-                )
-                required_services.append(cdn_config)
-
-            # Create requirement object
-            requirement = CloudServiceRequirement(
-                project_type=project_type,
-                project_subtype=result.get('project_subtype'),
-                primary_language=result.get('primary_language'),
-                required_services=required_services,
-                analysis_reasoning=result.get('reasoning', 'AI分析'),
-                confidence=0.9  # High confidence for AI analysis
+        # CDN
+        if result.get('needs_cdn', False):
+            cdn_config = ServiceRequirement(
+                service_type=CloudServiceType.CDN
             )
+            required_services.append(cdn_config)
 
-            return requirement
+        # Create requirement object
+        return CloudServiceRequirement(
+            project_type=project_type,
+            project_subtype=result.get('project_subtype'),
+            primary_language=result.get('primary_language'),
+            required_services=required_services,
+            analysis_reasoning=result.get('reasoning', 'AI分析'),
+            confidence=0.9  # High confidence for AI analysis
+        )
 
-        except Exception as e:
-            self.log(f"AI analysis failed: {e}")
-            import traceback
-            if self.verbose:
-                traceback.print_exc()
-            return None
+    def _get_ai_client(self, anthropic, api_key: str):
+        """Return a cached Anthropic-compatible client for the selected model"""
+        key = (self.model, api_key)
+        client = _AI_CLIENT_CACHE.get(key)
+        if client is None:
+            if self.model == 'deepseek':
+                client = anthropic.Anthropic(api_key=api_key, base_url="https://api.deepseek.com/anthropic")
+            else:  # anthropic
+                client = anthropic.Anthropic(api_key=api_key)
+            _AI_CLIENT_CACHE[key] = client
+        return client
 
     def _detect_project_type_comprehensive(self, repo_path: str) -> Tuple[ProjectType, Optional[str], List[str]]:
         """
@@ -651,23 +1381,26 @@ class EnhancedResourceAnalyzer:
         Returns:
             Tuple of (ProjectType, subtype, detected_features)
         """
-        found_files = self.analysis_data.get('found_files', [])
-        readme = self.analysis_data.get('readme', '').lower()
+        found_list = self.analysis_data.get('found_files', [])
+        found_files = self._found_file_set()
+        readme = self.analysis_data.get('readme_lower')
+        if readme is None:
+            readme = self.analysis_data.get('readme', '').lower()
+        hits = frozenset(m.group(1) for m in README_KEYWORD_RE.finditer(readme))
         features = []
 
         # === ML/AI 项目检测 ===
-        ml_indicators = ['ml_training', 'ml_model', 'ml_inference', 'jupyter', 'ml_requirements']
-        if any(ind in found_files for ind in ml_indicators):
+        ml_indicators = ('ml_training', 'ml_model', 'ml_inference', 'jupyter', 'ml_requirements')
+        if not found_files.isdisjoint(ml_indicators):
             features.append('machine_learning')
 
             # Check for LLM-specific keywords
-            llm_keywords = ['llm', 'gpt', 'bert', 'transformer', 'huggingface', 'openai', 'chatgpt']
-            if any(kw in readme for kw in llm_keywords):
+            if hits & LLM_KEYWORDS:
                 features.append('large_language_model')
                 return ProjectType.LLM_SERVICE, 'LLM推理服务', features
 
             # Check for training vs inference
-            if 'ml_training' in found_files or 'train' in readme:
+            if 'ml_training' in found_files or 'train' in hits:
                 features.append('training')
                 return ProjectType.ML_TRAINING, 'ML模型训练', features
             else:
@@ -676,104 +1409,60 @@ class EnhancedResourceAnalyzer:
 
         # Check Python ML dependencies
         if 'python_deps' in found_files:
-            req_path = Path(repo_path) / 'requirements.txt'
-            if req_path.exists():
-                try:
-                    content = req_path.read_text().lower()
-                    ml_packages = ['tensorflow', 'torch', 'pytorch', 'keras', 'sklearn',
-                                   'transformers', 'numpy', 'pandas', 'scipy', 'jax']
-                    if any(pkg in content for pkg in ml_packages):
-                        features.append('machine_learning')
-                        return ProjectType.ML_INFERENCE, 'Python ML应用', features
-                except Exception:
-                    pass
+            content = self._read_requirements(repo_path)
+            if ML_PACKAGE_RE.search(content):
+                features.append('machine_learning')
+                return ProjectType.ML_INFERENCE, 'Python ML应用', features
 
         # === 数据处理项目检测 ===
-        data_keywords = ['spark', 'hadoop', 'airflow', 'luigi', 'dask', 'flink', 'kafka']
-        if any(kw in readme for kw in data_keywords):
+        if hits & DATA_KEYWORDS:
             features.append('big_data')
-            if 'spark' in readme or 'hadoop' in readme:
+            if 'spark' in hits or 'hadoop' in hits:
                 return ProjectType.BIG_DATA, 'Spark/Hadoop大数据', features
-            elif 'kafka' in readme or 'flink' in readme:
+            elif 'kafka' in hits or 'flink' in hits:
                 return ProjectType.STREAM_PROCESSING, '流处理', features
             else:
                 return ProjectType.DATA_ETL, 'ETL数据处理', features
 
         # === 前端项目检测 ===
-        frontend_frameworks = ['angular', 'vue', 'nextjs', 'nuxtjs', 'gatsby', 'svelte']
-        if any(fw in found_files for fw in frontend_frameworks):
+        frontend_frameworks = ('angular', 'vue', 'nextjs', 'nuxtjs', 'gatsby', 'svelte')
+        if not found_files.isdisjoint(frontend_frameworks):
             features.append('frontend_framework')
             return ProjectType.WEB_FRONTEND, '前端应用', features
 
         # Check for static site
-        if 'nodejs' in found_files and 'package.json' in Path(repo_path).rglob('*'):
-            try:
-                pkg_json = Path(repo_path) / 'package.json'
-                if pkg_json.exists():
-                    pkg_content = pkg_json.read_text()
-                    if 'gatsby' in pkg_content or 'next' in pkg_content or 'vite' in pkg_content:
-                        features.append('static_site')
-                        return ProjectType.WEB_STATIC, '静态网站', features
-            except:
-                pass
+        if 'nodejs' in found_files:
+            if not self._node_dependency_names(repo_path).isdisjoint(STATIC_SITE_PACKAGES):
+                features.append('static_site')
+                return ProjectType.WEB_STATIC, '静态网站', features
 
         # === 后端 API 检测 ===
         # Check for API frameworks
-        api_indicators = {
-            'flask': 'Flask API',
-            'fastapi': 'FastAPI',
-            'django': 'Django',
-            'express': 'Express.js',
-            'koa': 'Koa.js',
-            'spring': 'Spring Boot',
-            'gin': 'Gin (Go)',
-            'echo': 'Echo (Go)',
-            'actix': 'Actix (Rust)',
-        }
-
-        for framework, description in api_indicators.items():
-            if framework in readme or framework in str(found_files):
+        found_files_str = str(found_list)
+        for framework, description in API_INDICATORS.items():
+            if framework in hits or framework in found_files_str:
                 features.append('backend_api')
                 features.append(framework)
                 return ProjectType.WEB_BACKEND, description, features
 
         # === 微服务检测 ===
         if 'k8s_config' in found_files or 'helm' in found_files or 'docker_compose' in found_files:
-            microservice_keywords = ['microservice', 'grpc', 'service mesh', 'istio']
-            if any(kw in readme for kw in microservice_keywords):
+            if hits & MICROSERVICE_KEYWORDS:
                 features.append('microservices')
                 return ProjectType.MICROSERVICES, '微服务架构', features
 
         # === 全栈项目检测 ===
-        has_frontend = any(fw in found_files for fw in ['angular', 'vue', 'nodejs'])
+        has_frontend = not found_files.isdisjoint(('angular', 'vue', 'nodejs'))
         has_backend = 'python_deps' in found_files or 'java_maven' in found_files
         if has_frontend and has_backend:
             features.append('fullstack')
             return ProjectType.WEB_FULLSTACK, '全栈应用', features
 
-        # === 移动后端检测 ===
-        mobile_keywords = ['mobile', 'ios', 'android', 'flutter', 'react native']
-        if any(kw in readme for kw in mobile_keywords):
-            features.append('mobile_backend')
-            return ProjectType.MOBILE_BACKEND, '移动应用后端', features
-
-        # === 电商项目检测 ===
-        ecommerce_keywords = ['ecommerce', 'e-commerce', 'shopping', 'cart', 'payment', 'order']
-        if any(kw in readme for kw in ecommerce_keywords):
-            features.append('ecommerce')
-            return ProjectType.ECOMMERCE, '电商平台', features
-
-        # === 游戏服务器检测 ===
-        game_keywords = ['game', 'unity', 'unreal', 'multiplayer', 'mmo']
-        if any(kw in readme for kw in game_keywords):
-            features.append('game_server')
-            return ProjectType.GAME_SERVER, '游戏服务器', features
-
-        # === CMS 检测 ===
-        cms_keywords = ['cms', 'content management', 'wordpress', 'strapi', 'ghost']
-        if any(kw in readme for kw in cms_keywords):
-            features.append('cms')
-            return ProjectType.CONTENT_MANAGEMENT, 'CMS系统', features
+        # === 移动后端 / 电商 / 游戏服务器 / CMS 检测 ===
+        for keywords, project_type, subtype, feature in README_TYPE_RULES:
+            if hits & keywords:
+                features.append(feature)
+                return project_type, subtype, features
 
         # === 数据库应用检测 ===
         if 'sql_files' in found_files or 'db_migrations' in found_files:
@@ -781,7 +1470,7 @@ class EnhancedResourceAnalyzer:
             return ProjectType.DATABASE_APP, '数据库应用', features
 
         # === CI/CD 工具检测 ===
-        if any(ci in found_files for ci in ['github_actions', 'gitlab_ci', 'jenkins']):
+        if not found_files.isdisjoint(('github_actions', 'gitlab_ci', 'jenkins')):
             features.append('cicd')
             return ProjectType.CI_CD, 'CI/CD系统', features
 
@@ -792,178 +1481,107 @@ class EnhancedResourceAnalyzer:
 
         return ProjectType.GENERAL, None, features
 
+    def _node_dependency_names(self, repo_path: str) -> AbstractSet[str]:
+        """Names of the dependencies and devDependencies declared in package.json"""
+        pkg_content = self._complete_key_file('node_deps')
+        if pkg_content is None:
+            try:
+                pkg_content = (Path(repo_path) / 'package.json').read_text(encoding='utf-8', errors='ignore')
+            except OSError:
+                return frozenset()
+        try:
+            package = _json_loads(pkg_content)
+        except ValueError:
+            return frozenset()
+        if not isinstance(package, dict):
+            return frozenset()
+
+        names = set()
+        for section in ('dependencies', 'devDependencies'):
+            deps = package.get(section)
+            if isinstance(deps, dict):
+                names.update(deps)
+        return names
+
     def _determine_cloud_services(
         self,
         project_type: ProjectType,
-        features: List[str],
+        features: AbstractSet[str],
         repo_path: str
     ) -> List[ServiceRequirement]:
         """
         Determine required cloud services based on project type and features
+
+        features should be converted to a set once by the caller and shared
+        with _generate_service_configs.
         """
-        required_services = []
+        flags = self._compute_service_flags(project_type, features)
 
-        # Get default services for this project type
+        # CVM (云服务器) - 几乎所有项目都需要
         default_services = get_default_services_for_project(project_type)
+        flags['cvm'] = CloudServiceType.CVM in default_services or project_type != ProjectType.SERVERLESS
 
-        # CVM (云服务器) - 几乎所有项目都需要
-        if CloudServiceType.CVM in default_services or project_type != ProjectType.SERVERLESS:
-            required_services.append(ServiceRequirement(
-                service_type=CloudServiceType.CVM,
-                required=True,
-                reason="运行应用程序主服务"
-            ))
-
-        # MySQL 数据库
-        if self._needs_mysql(project_type, features, repo_path):
-            required_services.append(ServiceRequirement(
-                service_type=CloudServiceType.MYSQL,
-                required=True,
-                reason="持久化存储业务数据"
-            ))
+        # MySQL 数据库（还需检查数据库文件和驱动依赖）
+        flags['mysql'] = self._needs_mysql(flags, repo_path)
 
-        # Redis 缓存
-        if self._needs_redis(project_type, features):
-            required_services.append(ServiceRequirement(
-                service_type=CloudServiceType.REDIS,
-                required=False,
-                reason="缓存热点数据，提升性能"
-            ))
+        # Kubernetes
+        flags['kubernetes'] = 'microservices' in features or 'k8s_config' in self._found_file_set()
 
-        # 对象存储
-        if self._needs_object_storage(project_type, features):
-            required_services.append(ServiceRequirement(
-                service_type=CloudServiceType.OBJECT_STORAGE,
-                required=False,
-                reason="存储文件、图片、视频等静态资源"
-            ))
+        return [
+            ServiceRequirement(service_type=service_type, required=required, reason=reason)
+            for flag, service_type, required, reason in SERVICE_REQUIREMENTS
+            if flags[flag]
+        ]
 
-        # CDN
-        if self._needs_cdn(project_type, features):
-            required_services.append(ServiceRequirement(
-                service_type=CloudServiceType.CDN,
-                required=False,
-                reason="加速静态资源访问"
-            ))
-
-        # 负载均衡
-        if self._needs_load_balancer(project_type, features):
-            required_services.append(ServiceRequirement(
-                service_type=CloudServiceType.LOAD_BALANCER,
-                required=False,
-                reason="分发流量，提高可用性"
-            ))
-
-        # GPU 计算
-        if 'machine_learning' in features or project_type in [
-            ProjectType.ML_TRAINING, ProjectType.ML_INFERENCE, ProjectType.LLM_SERVICE
-        ]:
-            required_services.append(ServiceRequirement(
-                service_type=CloudServiceType.GPU_COMPUTE,
-                required=True,
-                reason="GPU加速模型训练/推理"
-            ))
+    def _compute_service_flags(self, project_type: ProjectType, features: AbstractSet[str]) -> Dict[str, bool]:
+        """判断各项可选服务是否需要（仅基于项目类型和特征）"""
+        return {
+            name: project_type in project_types or not features.isdisjoint(triggers)
+            for name, project_types, triggers in SERVICE_FLAG_RULES
+        }
 
-        # Kubernetes
-        if 'microservices' in features or 'k8s_config' in self.analysis_data.get('found_files', []):
-            required_services.append(ServiceRequirement(
-                service_type=CloudServiceType.KUBERNETES,
-                required=False,
-                reason="容器编排和微服务管理"
-            ))
-
-        # 消息队列
-        if project_type in [ProjectType.MICROSERVICES, ProjectType.BIG_DATA, ProjectType.STREAM_PROCESSING]:
-            required_services.append(ServiceRequirement(
-                service_type=CloudServiceType.MESSAGE_QUEUE,
-                required=False,
-                reason="异步消息处理"
-            ))
-
-        return required_services
-
-    def _needs_mysql(self, project_type: ProjectType, features: List[str], repo_path: str) -> bool:
+    def _needs_mysql(self, flags: Dict[str, bool], repo_path: str) -> bool:
         """判断是否需要 MySQL"""
         # 明确需要数据库的项目类型
-        needs_db_types = [
-            ProjectType.WEB_BACKEND,
-            ProjectType.WEB_FULLSTACK,
-            ProjectType.DATABASE_APP,
-            ProjectType.MICROSERVICES,
-            ProjectType.MOBILE_BACKEND,
-            ProjectType.ECOMMERCE,
-            ProjectType.CRM_ERP,
-            ProjectType.CONTENT_MANAGEMENT,
-        ]
-
-        if project_type in needs_db_types:
+        if flags['mysql']:
             return True
 
         # 检查是否有数据库配置文件
-        found_files = self.analysis_data.get('found_files', [])
+        found_files = self._found_file_set()
         if 'sql_files' in found_files or 'db_migrations' in found_files:
             return True
 
         # 检查依赖中是否有数据库驱动
         if 'python_deps' in found_files:
-            req_path = Path(repo_path) / 'requirements.txt'
-            if req_path.exists():
-                try:
-                    content = req_path.read_text().lower()
-                    db_packages = ['mysql', 'pymysql', 'mysqlclient', 'sqlalchemy', 'django', 'flask-sqlalchemy']
-                    if any(pkg in content for pkg in db_packages):
-                        return True
-                except:
-                    pass
+            content = self._read_requirements(repo_path)
+            if DB_PACKAGE_RE.search(content):
+                return True
 
         return False
 
-    def _needs_redis(self, project_type: ProjectType, features: List[str]) -> bool:
-        """判断是否需要 Redis"""
-        # 高流量、需要缓存的项目类型
-        return project_type in [
-            ProjectType.WEB_BACKEND,
-            ProjectType.WEB_FULLSTACK,
-            ProjectType.MICROSERVICES,
-            ProjectType.MOBILE_BACKEND,
-            ProjectType.ECOMMERCE,
-            ProjectType.LLM_SERVICE,
-        ]
-
-    def _needs_object_storage(self, project_type: ProjectType, features: List[str]) -> bool:
-        """判断是否需要对象存储"""
-        return project_type in [
-            ProjectType.WEB_FULLSTACK,
-            ProjectType.MOBILE_BACKEND,
-            ProjectType.ECOMMERCE,
-            ProjectType.CONTENT_MANAGEMENT,
-            ProjectType.ML_TRAINING,
-            ProjectType.DATA_ETL,
-            ProjectType.BIG_DATA,
-        ]
-
-    def _needs_cdn(self, project_type: ProjectType, features: List[str]) -> bool:
-        """判断是否需要 CDN"""
-        return project_type in [
-            ProjectType.WEB_FRONTEND,
-            ProjectType.WEB_STATIC,
-            ProjectType.WEB_FULLSTACK,
-            ProjectType.ECOMMERCE,
-            ProjectType.CONTENT_MANAGEMENT,
-        ]
+    def _complete_key_file(self, key: str) -> Optional[str]:
+        """Key file content stored by _read_key_files, or None if it is missing or was truncated"""
+        content = self.analysis_data.get(key)
+        if content is not None and len(content) < KEY_FILE_MAX_CHARS:
+            return content
+        return None
 
-    def _needs_load_balancer(self, project_type: ProjectType, features: List[str]) -> bool:
-        """判断是否需要负载均衡"""
-        return project_type in [
-            ProjectType.MICROSERVICES,
-            ProjectType.ECOMMERCE,
-            ProjectType.LLM_SERVICE,
-        ] or 'high_traffic' in features
+    def _read_requirements(self, repo_path: str) -> str:
+        """Return lower-cased requirements.txt content, reading the file only once"""
+        if self._requirements_content is None:
+            content = self._complete_key_file('python_deps')
+            if content is None:
+                try:
+                    content = (Path(repo_path) / 'requirements.txt').read_text(errors='ignore')
+                except OSError:
+                    content = ''
+            self._requirements_content = content.lower()
+        return self._requirements_content
 
     def _generate_service_configs(
         self,
         project_type: ProjectType,
-        features: List[str]
+        features: AbstractSet[str]
     ) -> Tuple[Optional[Dict], Optional[Dict]]:
         """
         Generate CVM and database configurations based on project type
@@ -971,56 +1589,15 @@ class EnhancedResourceAnalyzer:
         Returns:
             Tuple of (cvm_config, database_config)
         """
-        cvm_config = None
-        db_config = None
-
         # === CVM 配置 ===
-        if project_type in [ProjectType.ML_TRAINING, ProjectType.ML_INFERENCE, ProjectType.LLM_SERVICE]:
-            # ML/AI 项目需要 GPU
-            gpu_type = 'T4' if project_type == ProjectType.ML_INFERENCE else 'V100'
-            cvm_config = {
-                'cpu_cores': 8 if project_type == ProjectType.ML_INFERENCE else 16,
-                'memory_gb': 32 if project_type == ProjectType.ML_INFERENCE else 64,
-                'disk_gb': 200 if project_type == ProjectType.ML_INFERENCE else 500,
-                'gpu_type': gpu_type,
-            }
-        elif project_type in [ProjectType.BIG_DATA, ProjectType.DATA_ETL]:
-            # 数据处理项目
-            cvm_config = {
-                'cpu_cores': 16,
-                'memory_gb': 64,
-                'disk_gb': 500,
-            }
-        elif project_type in [ProjectType.ECOMMERCE, ProjectType.MICROSERVICES]:
-            # 高流量项目
-            cvm_config = {
-                'cpu_cores': 8,
-                'memory_gb': 16,
-                'disk_gb': 200,
-            }
-        else:
-            # 默认配置
-            cvm_config = {
-                'cpu_cores': 2,
-                'memory_gb': 4,
-                'disk_gb': 100,
-            }
+        cvm_config = dict(CVM_CONFIGS.get(project_type, DEFAULT_CVM_CONFIG))
 
         # === 数据库配置 ===
-        if 'database_heavy' in features or project_type in [ProjectType.DATABASE_APP, ProjectType.ECOMMERCE]:
-            db_config = {
-                'cpu_cores': 4,
-                'memory_mb': 8000,
-                'storage_gb': 200,
-                'version': '8.0',
-            }
-        elif project_type in [ProjectType.WEB_BACKEND, ProjectType.WEB_FULLSTACK, ProjectType.MOBILE_BACKEND]:
-            db_config = {
-                'cpu_cores': 2,
-                'memory_mb': 4000,
-                'storage_gb': 100,
-                'version': '8.0',
-            }
+        db_config = None
+        if 'database_heavy' in features or project_type in HEAVY_DB_PROJECT_TYPES:
+            db_config = dict(HEAVY_DB_CONFIG)
+        elif project_type in STANDARD_DB_PROJECT_TYPES:
+            db_config = dict(STANDARD_DB_CONFIG)
 
         return cvm_config, db_config
 
@@ -1031,77 +1608,24 @@ class EnhancedResourceAnalyzer:
         Returns:
             主要编程语言字符串（如 'golang', 'python', 'nodejs'）
         """
-        found_files = self.analysis_data.get('found_files', [])
-
-        # 语言优先级映射（按特异性排序）
-        language_priority = {
-            'golang': 10,
-            'rust': 9,
-            'java_maven': 8,
-            'java_gradle': 8,
-            'nodejs': 7,
-            'python_modern': 6,
-            'python_setup': 5,
-            'python_deps': 4,
-            'php': 3,
-            'ruby': 2,
-        }
-
-        # 找到优先级最高的语言
-        best_language = None
-        best_priority = -1
-
-        for file_type in found_files:
-            priority = language_priority.get(file_type, 0)
-            if priority > best_priority:
-                best_priority = priority
-                best_language = file_type
-
-        # 统一返回值
-        if best_language:
-            if best_language == 'golang':
-                return 'golang'
-            elif best_language in ['java_maven', 'java_gradle']:
-                return 'java'
-            elif best_language == 'nodejs':
-                return 'nodejs'
-            elif best_language in ['python_modern', 'python_setup', 'python_deps']:
-                return 'python'
-            elif best_language == 'rust':
-                return 'rust'
-            elif best_language == 'php':
-                return 'php'
-            elif best_language == 'ruby':
-                return 'ruby'
-
-        return None
+        # 只比较识别为语言的文件类型，找到优先级最高的语言
+        language_files = self._found_file_set() & LANGUAGE_PRIORITY.keys()
+        best_language = max(language_files, key=LANGUAGE_PRIORITY.__getitem__, default=None)
+        return LANGUAGE_CANONICAL.get(best_language)
 
     def _calculate_confidence(self, features: List[str]) -> float:
         """Calculate confidence based on detected features"""
-        base_confidence = 0.5
-
         # More features = higher confidence
-        if len(features) >= 5:
-            base_confidence = 0.9
-        elif len(features) >= 3:
-            base_confidence = 0.8
-        elif len(features) >= 2:
-            base_confidence = 0.7
-        elif len(features) >= 1:
-            base_confidence = 0.6
-
-        return base_confidence
+        return CONFIDENCE_VALUES[bisect.bisect_right(CONFIDENCE_THRESHOLDS, len(features))]
 
     def _build_reasoning(self, project_type: ProjectType, features: List[str]) -> str:
         """Build human-readable reasoning"""
-        lines = [
-            f"检测到项目类型为 {project_type.value}",
-            f"检测到的特征: {', '.join(features) if features else '无'}",
-        ]
-        return " | ".join(lines)
+        features_str = ', '.join(features) if features else '无'
+        return f"检测到项目类型为 {project_type.value} | 检测到的特征: {features_str}"
 
     def _create_default_requirement(self) -> CloudServiceRequirement:
-        """Create default requirement when analysis fails"""
+        """Create the default requirement used when analysis fails"""
+        # Built per call: the requirement holds mutable dicts and caches
         return CloudServiceRequirement(
             project_type=ProjectType.GENERAL,
             required_services=[
@@ -1121,6 +1645,9 @@ def analyze_cloud_services(repo_url: str, verbose: bool = False, model: str = 'd
     """
     Convenience function to analyze repository and determine cloud service requirements
 
+    Successful analyses are reused across calls through the on-disk analysis
+    cache, keyed by the repository's HEAD commit.
+
     Args:
         repo_url: GitHub repository URL
         verbose: Enable verbose logging
@@ -1132,3 +1659,20 @@ def analyze_cloud_services(repo_url: str, verbose: bool = False, model: str = 'd
     """
     analyzer = EnhancedResourceAnalyzer(repo_url, verbose=verbose, model=model, session_dir=session_dir)
     return analyzer.analyze()
+
+
+def analyze_cloud_services_batch(repo_urls: List[str], verbose: bool = False, model: str = 'deepseek',
+                                 max_workers: int = MAX_FETCH_WORKERS) -> List[Optional[CloudServiceRequirement]]:
+    """
+    Convenience function to analyze many repositories concurrently
+
+    Args:
+        repo_urls: GitHub repository URLs
+        verbose: Enable verbose logging
+        model: AI model to use ('deepseek' or 'anthropic')
+        max_workers: Maximum number of repositories fetched at once
+
+    Returns:
+        One CloudServiceRequirement (or None if analysis failed) per URL, in input order
+    """
+    return EnhancedResourceAnalyzer.analyze_batch(repo_urls, verbose=verbose, model=model, max_workers=max_workers)
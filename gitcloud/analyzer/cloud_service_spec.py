@@ -5,11 +5,22 @@ Cloud Service Specification Module for GitCloud
 Defines cloud service requirements and project type classifications.
 """
 
+import sys
 from dataclasses import dataclass, field, asdict
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from enum import Enum
+from types import MappingProxyType
 import json
 
+try:
+    import orjson
+
+    def _json_dumps(data: Any) -> str:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    def _json_dumps(data: Any) -> str:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
 
 class ProjectType(Enum):
     """
@@ -107,7 +118,19 @@ class CloudServiceType(Enum):
     MONITORING = "monitoring"  # 监控告警
 
 
-@dataclass
+# value -> member lookups for from_dict, cheaper than calling the Enum class
+PROJECT_TYPE_BY_VALUE = {t.value: t for t in ProjectType}
+SERVICE_TYPE_BY_VALUE = {t.value: t for t in CloudServiceType}
+
+# get_summary 中每个服务行的状态前缀
+_SUMMARY_STATUS_REQUIRED = "  ✓ 必需 "
+_SUMMARY_STATUS_OPTIONAL = "  ○ 可选 "
+
+# dataclass(slots=True) is only available on Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ServiceRequirement:
     """单个云服务需求"""
     service_type: CloudServiceType
@@ -142,7 +165,7 @@ class ServiceRequirement:
         return result
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CloudServiceRequirement:
     """
     云服务需求完整规格
@@ -180,7 +203,7 @@ class CloudServiceRequirement:
 
     def requires_service(self, service_type: CloudServiceType) -> bool:
         """检查是否需要某个服务"""
-        return service_type in self.get_service_types()
+        return any(svc.service_type is service_type and svc.required for svc in self.required_services)
 
     def get_service_config(self, service_type: CloudServiceType) -> Optional[Dict[str, Any]]:
         """获取某个服务的配置"""
@@ -194,6 +217,7 @@ class CloudServiceRequirement:
         return {
             "project_type": self.project_type.value,
             "project_subtype": self.project_subtype,
+            "primary_language": self.primary_language,
             "required_services": [svc.to_dict() for svc in self.required_services],
             "cvm_config": self.cvm_config,
             "database_config": self.database_config,
@@ -205,7 +229,7 @@ class CloudServiceRequirement:
 
     def to_json(self) -> str:
         """转换为 JSON"""
-        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        return _json_dumps(self.to_dict())
 
     def to_tencent_spec(self, region: str = "ap-guangzhou") -> Dict[str, Any]:
         """
@@ -251,6 +275,10 @@ class CloudServiceRequirement:
 
         return spec
 
+    def _cvm_gpu_required(self) -> bool:
+        """检查 CVM 是否需要 GPU"""
+        return any(svc.service_type is CloudServiceType.CVM and svc.gpu_required for svc in self.required_services)
+
     def get_recommended_docker_image(self) -> Dict[str, Any]:
         """
         获取推荐的 Docker 镜像信息
@@ -258,16 +286,10 @@ class CloudServiceRequirement:
         Returns:
             镜像信息字典，包含 image, description, includes
         """
+        # docker_images imports ProjectType from this module, so import it lazily
         from .docker_images import get_recommended_image
 
-        # 检查是否需要 GPU
-        gpu_required = False
-        for svc in self.required_services:
-            if svc.service_type == CloudServiceType.CVM and svc.gpu_required:
-                gpu_required = True
-                break
-
-        return get_recommended_image(self.project_type, gpu_required, self.primary_language)
+        return get_recommended_image(self.project_type, self._cvm_gpu_required(), self.primary_language)
 
     def get_dockerfile(self) -> str:
         """
@@ -278,35 +300,34 @@ class CloudServiceRequirement:
         """
         from .docker_images import get_dockerfile_for_project
 
-        # 检查是否需要 GPU
-        gpu_required = False
-        for svc in self.required_services:
-            if svc.service_type == CloudServiceType.CVM and svc.gpu_required:
-                gpu_required = True
-                break
-
-        return get_dockerfile_for_project(self.project_type, gpu_required)
+        return get_dockerfile_for_project(self.project_type, self._cvm_gpu_required())
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CloudServiceRequirement':
         """从字典创建"""
-        # 转换服务类型枚举
-        project_type = ProjectType(data['project_type'])
+        # 转换服务类型枚举（未知值仍交给 Enum 抛出 ValueError）
+        project_type = PROJECT_TYPE_BY_VALUE.get(data['project_type']) or ProjectType(data['project_type'])
 
         # 转换服务需求列表
-        required_services = []
-        for svc_data in data.get('required_services', []):
-            service_type = CloudServiceType(svc_data['service_type'])
-            required_services.append(ServiceRequirement(
-                service_type=service_type,
+        required_services = [
+            ServiceRequirement(
+                service_type=SERVICE_TYPE_BY_VALUE.get(svc_data['service_type']) or CloudServiceType(svc_data['service_type']),
                 required=svc_data.get('required', True),
                 reason=svc_data.get('reason', ''),
-                config=svc_data.get('config', {})
-            ))
+                config=svc_data.get('config', {}),
+                cpu_cores=svc_data.get('cpu_cores'),
+                memory_gb=svc_data.get('memory_gb'),
+                disk_gb=svc_data.get('disk_gb'),
+                gpu_required=svc_data.get('gpu_required', False),
+                gpu_type=svc_data.get('gpu_type')
+            )
+            for svc_data in data.get('required_services', [])
+        ]
 
         return cls(
             project_type=project_type,
             project_subtype=data.get('project_subtype'),
+            primary_language=data.get('primary_language'),
             required_services=required_services,
             cvm_config=data.get('cvm_config'),
             database_config=data.get('database_config'),
@@ -318,19 +339,17 @@ class CloudServiceRequirement:
 
     def get_summary(self) -> str:
         """获取可读摘要"""
-        lines = [
-            f"项目类型: {self.project_type.value}",
-        ]
+        lines = [f"项目类型: {self.project_type.value}"]
 
         if self.project_subtype:
             lines.append(f"子类型: {self.project_subtype}")
 
         lines.append(f"置信度: {self.confidence:.1%}")
-        lines.append(f"\n需要的云服务:")
+        lines.append("\n需要的云服务:")
 
         for svc in self.required_services:
-            status = "✓ 必需" if svc.required else "○ 可选"
-            lines.append(f"  {status} {svc.service_type.value}")
+            status = _SUMMARY_STATUS_REQUIRED if svc.required else _SUMMARY_STATUS_OPTIONAL
+            lines.append(status + svc.service_type.value)
             if svc.reason:
                 lines.append(f"     原因: {svc.reason}")
 
@@ -340,90 +359,93 @@ class CloudServiceRequirement:
         return "\n".join(lines)
 
 
-# 项目类型到服务映射模板
-PROJECT_SERVICE_MAPPING = {
-    ProjectType.WEB_FRONTEND: [
+# 项目类型到服务映射模板（只读）
+PROJECT_SERVICE_MAPPING = MappingProxyType({
+    ProjectType.WEB_FRONTEND: (
         CloudServiceType.CVM,
         CloudServiceType.CDN,
-    ],
+    ),
 
-    ProjectType.WEB_BACKEND: [
+    ProjectType.WEB_BACKEND: (
         CloudServiceType.CVM,
         CloudServiceType.MYSQL,
         CloudServiceType.REDIS,
         CloudServiceType.LOAD_BALANCER,
-    ],
+    ),
 
-    ProjectType.WEB_FULLSTACK: [
+    ProjectType.WEB_FULLSTACK: (
         CloudServiceType.CVM,
         CloudServiceType.MYSQL,
         CloudServiceType.REDIS,
         CloudServiceType.OBJECT_STORAGE,
         CloudServiceType.CDN,
-    ],
+    ),
 
-    ProjectType.DATABASE_APP: [
+    ProjectType.DATABASE_APP: (
         CloudServiceType.CVM,
         CloudServiceType.MYSQL,
-    ],
+    ),
 
-    ProjectType.MICROSERVICES: [
+    ProjectType.MICROSERVICES: (
         CloudServiceType.CVM,
         CloudServiceType.KUBERNETES,
         CloudServiceType.MYSQL,
         CloudServiceType.REDIS,
         CloudServiceType.MESSAGE_QUEUE,
         CloudServiceType.LOAD_BALANCER,
-    ],
+    ),
 
-    ProjectType.ML_TRAINING: [
+    ProjectType.ML_TRAINING: (
         CloudServiceType.GPU_COMPUTE,
         CloudServiceType.OBJECT_STORAGE,
-    ],
+    ),
 
-    ProjectType.ML_INFERENCE: [
+    ProjectType.ML_INFERENCE: (
         CloudServiceType.CVM,
         CloudServiceType.REDIS,
-    ],
+    ),
 
-    ProjectType.LLM_SERVICE: [
+    ProjectType.LLM_SERVICE: (
         CloudServiceType.GPU_COMPUTE,
         CloudServiceType.REDIS,
         CloudServiceType.LOAD_BALANCER,
-    ],
+    ),
 
-    ProjectType.DATA_ETL: [
+    ProjectType.DATA_ETL: (
         CloudServiceType.CVM,
         CloudServiceType.MYSQL,
         CloudServiceType.OBJECT_STORAGE,
-    ],
+    ),
 
-    ProjectType.BIG_DATA: [
+    ProjectType.BIG_DATA: (
         CloudServiceType.CVM,
         CloudServiceType.SPARK_CLUSTER,
         CloudServiceType.DATA_WAREHOUSE,
         CloudServiceType.OBJECT_STORAGE,
-    ],
+    ),
 
-    ProjectType.MOBILE_BACKEND: [
+    ProjectType.MOBILE_BACKEND: (
         CloudServiceType.CVM,
         CloudServiceType.MYSQL,
         CloudServiceType.REDIS,
         CloudServiceType.OBJECT_STORAGE,
         CloudServiceType.CDN,
-    ],
+    ),
 
-    ProjectType.ECOMMERCE: [
+    ProjectType.ECOMMERCE: (
         CloudServiceType.CVM,
         CloudServiceType.MYSQL,
         CloudServiceType.REDIS,
         CloudServiceType.OBJECT_STORAGE,
         CloudServiceType.CDN,
         CloudServiceType.LOAD_BALANCER,
-    ],
-}
+    ),
+})
+
+
+DEFAULT_PROJECT_SERVICES = (CloudServiceType.CVM,)
 
 
-def get_default_services_for_project(project_type: ProjectType) -> List[CloudServiceType]:
+def get_default_services_for_project(project_type: ProjectType) -> Tuple[CloudServiceType, ...]:
     """获取项目类型的默认服务列表"""
-    return PROJECT_SERVICE_MAPPING.get(project_type, [CloudServiceType.CVM])
+    return PROJECT_SERVICE_MAPPING.get(project_type, DEFAULT_PROJECT_SERVICES)
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Tests for the rule-based helpers of the resource analyzer
+"""
+
+import unittest
+
+from gitcloud.analyzer.analyer import EnhancedResourceAnalyzer
+
+
+class CalculateConfidenceTest(unittest.TestCase):
+    """_calculate_confidence must keep the values of the original if/elif chain"""
+
+    def setUp(self):
+        self.analyzer = EnhancedResourceAnalyzer("https://github.com/owner/repo")
+
+    def test_confidence_by_feature_count(self):
+        expected = {0: 0.5, 1: 0.6, 2: 0.7, 3: 0.8, 4: 0.8, 5: 0.9, 10: 0.9}
+        for count, confidence in expected.items():
+            with self.subTest(features=count):
+                features = [f"feature_{i}" for i in range(count)]
+                self.assertEqual(self.analyzer._calculate_confidence(features), confidence)
+
+
+if __name__ == '__main__':
+    unittest.main()